@@ -0,0 +1,169 @@
+"""Per-user response cache with ETag revalidation.
+
+Every user has a data version that is bumped after any task, goal or
+journal write commits. Cached GET responses are keyed by
+``(user, version, URL)`` and their ETag is derived from the version
+alone, so an ``If-None-Match`` that still matches is answered with 304
+before any query runs, and an unchanged page is served from cache
+without re-serializing.
+
+Versions and bodies live in process memory by default, which is only
+correct with a single worker. Set ``RESPONSE_CACHE_REDIS_URL`` to share
+both between workers. Cache calls are coroutines so that the Redis
+backend talks to Redis without blocking the event loop; sync endpoints
+reach them through ``anyio.from_thread.run``.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import json
+import threading
+import time
+import os
+
+from fastapi import Request, Response
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+
+CachedBody = Tuple[bytes, Dict[str, str]]
+
+class MemoryBackend:
+    """Versions and an LRU of bodies for a single process.
+
+    Versions start from the process start time so that ETags handed out
+    before a restart can never match again afterwards. Each bump takes the
+    next value of one process-wide counter, and only the ``maxsize`` most
+    recently bumped users keep their own; the rest share the highest
+    version evicted so far, so a user's version never goes back to a value
+    it had before a write.
+    """
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.maxsize = maxsize
+        self._epoch = format(time.time_ns(), "x")
+        self._versions: "OrderedDict[int, int]" = OrderedDict()
+        self._counter = 0
+        self._evicted = 0
+        self._bodies = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def version(self, user_id: int) -> str:
+        with self._lock:
+            return f"{self._epoch}.{self._versions.get(user_id, self._evicted)}"
+
+    async def bump(self, user_id: int) -> None:
+        with self._lock:
+            self._counter += 1
+            self._versions[user_id] = self._counter
+            self._versions.move_to_end(user_id)
+            while len(self._versions) > self.maxsize:
+                _, version = self._versions.popitem(last=False)
+                self._evicted = max(self._evicted, version)
+
+    async def get(self, key: str) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._bodies.get(key)
+            if entry is not None:
+                self._bodies.move_to_end(key)
+            return entry
+
+    async def set(self, key: str, value: CachedBody) -> None:
+        with self._lock:
+            self._bodies[key] = value
+            self._bodies.move_to_end(key)
+            while len(self._bodies) > self.maxsize:
+                self._bodies.popitem(last=False)
+
+class RedisBackend:
+    """Versions and bodies shared by all workers through Redis."""
+
+    def __init__(self, url: str, ttl: int = RESPONSE_CACHE_TTL_SECONDS):
+        from redis import asyncio as redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    async def version(self, user_id: int) -> str:
+        key = f"user-version:{user_id}"
+        value = await self.client.get(key)
+        if value is None:
+            # Seed from the clock so a flushed Redis never reissues old ETags.
+            await self.client.set(key, time.time_ns(), nx=True)
+            value = await self.client.get(key)
+        return value.decode()
+
+    async def bump(self, user_id: int) -> None:
+        key = f"user-version:{user_id}"
+        await self.client.set(key, time.time_ns(), nx=True)
+        await self.client.incr(key)
+
+    async def get(self, key: str) -> Optional[CachedBody]:
+        raw = await self.client.get(f"response:{key}")
+        if raw is None:
+            return None
+        headers_length = int.from_bytes(raw[:4], "big")
+        headers = json.loads(raw[4:4 + headers_length])
+        return raw[4 + headers_length:], headers
+
+    async def set(self, key: str, value: CachedBody) -> None:
+        body, headers = value
+        encoded = json.dumps(headers).encode()
+        await self.client.set(
+            f"response:{key}",
+            len(encoded).to_bytes(4, "big") + encoded + body,
+            ex=self.ttl,
+        )
+
+class CacheLookup:
+    def __init__(self, backend, key: str, etag: str):
+        self.backend = backend
+        self.key = key
+        self.headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        self.response: Optional[Response] = None
+
+    def build(self, body: bytes, headers: Dict[str, str]) -> Response:
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={**headers, **self.headers},
+        )
+
+    async def store(self, body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+        headers = headers or {}
+        await self.backend.set(self.key, (body, headers))
+        return self.build(body, headers)
+
+class ResponseCache:
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def bump(self, user_id: int) -> None:
+        """Invalidate everything cached for ``user_id``. Call after commit."""
+        await self.backend.bump(user_id)
+
+    async def etag(self, user_id: int, scope: str = "") -> str:
+        tag = f"{user_id}-{await self.backend.version(user_id)}"
+        return f'W/"{tag}-{scope}"' if scope else f'W/"{tag}"'
+
+    async def lookup(self, request: Request, user_id: int, scope: str = "") -> CacheLookup:
+        """Check the client's ETag and the body cache for the current version.
+
+        When ``lookup.response`` is set it can be returned as is; otherwise
+        render the body and return ``await lookup.store(body, headers)``. ``scope``
+        covers inputs other than the user's data, such as the current day.
+        """
+        etag = await self.etag(user_id, scope)
+        query = "&".join(sorted(request.url.query.split("&")))
+        lookup = CacheLookup(self.backend, f"{etag}:{request.url.path}?{query}", etag)
+        if etag in request.headers.get("if-none-match", ""):
+            lookup.response = Response(status_code=304, headers=lookup.headers)
+        else:
+            cached = await self.backend.get(lookup.key)
+            if cached is not None:
+                lookup.response = lookup.build(*cached)
+        return lookup
+
+response_cache = ResponseCache(
+    RedisBackend(RESPONSE_CACHE_REDIS_URL) if RESPONSE_CACHE_REDIS_URL else MemoryBackend()
+)
@@ -1,3 +1,7 @@
 from .tasks import router as tasks_router
 from .goals import router as goals_router
 from .auth import router as auth_router
+from .search import router as search_router
+from .events import router as events_router
+from .sync import router as sync_router
+from .export import router as export_router
\ No newline at end of file
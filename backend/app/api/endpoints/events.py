@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.security import OAuth2PasswordBearer
+from jose import jwt
+from typing import Optional
+import asyncio
+import os
+import time
+from ...db.session import AsyncSessionLocal
+from ..events import change_feed
+from backend.auth import get_current_active_user, get_current_user
+
+router = APIRouter()
+
+CHANGE_FEED_KEEPALIVE_SECONDS = float(os.getenv("CHANGE_FEED_KEEPALIVE_SECONDS", "15"))
+CHANGE_FEED_RETRY_MS = int(os.getenv("CHANGE_FEED_RETRY_MS", "3000"))
+
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+
+def stream_token(header_token: Optional[str], access_token: Optional[str]) -> str:
+    token = header_token or access_token
+    if not token:
+        raise HTTPException(
+            status_code=401,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token
+
+async def stream_user_id(token: str) -> int:
+    """Authenticate with a short-lived session so an open stream does not
+    hold a pooled connection."""
+    async with AsyncSessionLocal() as db:
+        user = await get_current_active_user(await get_current_user(token, db))
+        return user.id
+
+async def event_stream(user_id: int, token: str):
+    """Relay ``user_id``'s events until the client disconnects or ``token``
+    stops being valid.
+
+    The stream ends when the token expires. Every keepalive interval the
+    token is checked again, so a deactivated or deleted user loses the
+    stream once the principal cache lets go of them.
+    """
+    expires_at = jwt.get_unverified_claims(token)["exp"]
+    recheck_at = time.monotonic() + CHANGE_FEED_KEEPALIVE_SECONDS
+    # The stream is torn down when the client disconnects, which runs the
+    # finally block.
+    subscription = change_feed.subscribe(user_id)
+    try:
+        yield f"retry: {CHANGE_FEED_RETRY_MS}\n\n"
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                return
+            try:
+                message = await asyncio.wait_for(
+                    subscription.get(), min(CHANGE_FEED_KEEPALIVE_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                message = None
+            if time.monotonic() >= recheck_at:
+                recheck_at = time.monotonic() + CHANGE_FEED_KEEPALIVE_SECONDS
+                try:
+                    await stream_user_id(token)
+                except HTTPException:
+                    return
+            if message is None:
+                # Keeps proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+            else:
+                yield f"data: {message}\n\n"
+    finally:
+        change_feed.unsubscribe(subscription)
+
+@router.get("/")
+async def stream_changes(
+    access_token: Optional[str] = None,
+    header_token: Optional[str] = Depends(optional_oauth2_scheme)
+):
+    """Server-sent events for every task, goal and journal write by the
+    current user.
+
+    Browsers' ``EventSource`` cannot send an ``Authorization`` header, so
+    the token may also be passed as ``?access_token=``. Load the lists the
+    events apply to after the ``retry`` line arrives, so nothing written
+    in between is missed. The stream closes when the token expires;
+    reconnect with a fresh one.
+    """
+    token = stream_token(header_token, access_token)
+    user_id = await stream_user_id(token)
+    return StreamingResponse(
+        event_stream(user_id, token),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
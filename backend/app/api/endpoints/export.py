@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
+from datetime import datetime
+from ..export import export_csv, export_ndjson, gzip_chunks
+from .events import stream_user_id
+from backend.auth import oauth2_scheme
+
+router = APIRouter()
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+@router.get("/")
+async def export_account(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    resource: Optional[Literal["tasks", "goals", "journals"]] = None,
+    gzip: bool = False,
+    token: str = Depends(oauth2_scheme)
+):
+    """Download the user's tasks, goals and journal entries as a stream.
+
+    NDJSON covers the whole account unless ``resource`` narrows it; CSV
+    needs a ``resource``. With ``gzip=true`` the file is compressed as it
+    is sent.
+    """
+    # Not get_current_active_user: its request session would stay open,
+    # holding a second connection, until the whole body has been sent.
+    user_id = await stream_user_id(token)
+    if export_format == "csv":
+        if resource is None:
+            raise HTTPException(status_code=400, detail="CSV exports need a resource: tasks, goals or journals")
+        chunks = export_csv(user_id, resource)
+    else:
+        chunks = export_ndjson(user_id, resource)
+
+    filename = f"productivity-plus-{resource or 'account'}-{datetime.utcnow():%Y%m%d}.{export_format}"
+    media_type = MEDIA_TYPES[export_format]
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
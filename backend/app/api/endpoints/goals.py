@@ -1,68 +1,90 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
-from ...db.session import get_db
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ...db.mutations import delete_owned, update_owned
+from ...db.session import get_async_db
+from ...db.sync import record_deletion
 from ...models.goal import Goal
 from ...models.user import User
 from ...schemas.goal import GoalCreate, GoalUpdate, GoalResponse
+from ..cache import response_cache
+from ..events import change_feed
+from ..serialization import ListSerializer
+from ..pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    apply_keyset,
+    split_page,
+)
 from backend.auth import get_current_active_user
 
 router = APIRouter()
 
+goal_serializer = ListSerializer(Goal, GoalResponse)
+
 @router.get("/", response_model=List[GoalResponse])
-def get_goals(
-    db: Session = Depends(get_db),
+async def get_goals(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    return db.query(Goal).filter(Goal.user_id == current_user.id).all()
+    cached = await response_cache.lookup(request, current_user.id)
+    if cached.response is not None:
+        return cached.response
+
+    query = apply_keyset(
+        goal_serializer.select().where(Goal.user_id == current_user.id),
+        Goal.target_date, Goal.id, cursor, limit
+    )
+    rows = goal_serializer.all(await db.execute(query))
+    goals, next_cursor = split_page(rows, limit, "target_date")
+    body = goal_serializer.dump(goals)
+    return await cached.store(body, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
 
 @router.post("/", response_model=GoalResponse)
-def create_goal(
+async def create_goal(
     goal: GoalCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     db_goal = Goal(**goal.dict(), user_id=current_user.id)
     db.add(db_goal)
-    db.commit()
-    db.refresh(db_goal)
+    await db.commit()
+    await response_cache.bump(current_user.id)
+    await db.refresh(db_goal)
+    await change_feed.publish(current_user.id, "goal", "created", db_goal.id, db_goal)
     return db_goal
 
 @router.put("/{goal_id}", response_model=GoalResponse)
-def update_goal(
+async def update_goal(
     goal_id: int,
     goal: GoalUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    db_goal = db.query(Goal).filter(
-        Goal.id == goal_id,
-        Goal.user_id == current_user.id
-    ).first()
-    if not db_goal:
+    row = await db.run_sync(update_owned, Goal, goal_id, current_user.id, goal.dict(exclude_unset=True))
+    if row is None:
         raise HTTPException(status_code=404, detail="Goal not found")
-    
-    for key, value in goal.dict(exclude_unset=True).items():
-        setattr(db_goal, key, value)
-    
-    db.commit()
-    db.refresh(db_goal)
-    return db_goal
+
+    await db.commit()
+    await response_cache.bump(current_user.id)
+    await change_feed.publish(current_user.id, "goal", "updated", row.id, row)
+    return row
 
 @router.delete("/{goal_id}")
-def delete_goal(
+async def delete_goal(
     goal_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    db_goal = db.query(Goal).filter(
-        Goal.id == goal_id,
-        Goal.user_id == current_user.id
-    ).first()
-    if not db_goal:
+    if await db.run_sync(delete_owned, Goal, goal_id, current_user.id) is None:
         raise HTTPException(status_code=404, detail="Goal not found")
-    
-    db.delete(db_goal)
-    db.commit()
-    return {"message": "Goal deleted successfully"} 
\ No newline at end of file
+
+    db.add(record_deletion(current_user.id, Goal, goal_id))
+    await db.commit()
+    await response_cache.bump(current_user.id)
+    await change_feed.publish(current_user.id, "goal", "deleted", goal_id)
+    return {"message": "Goal deleted successfully"}
\ No newline at end of file
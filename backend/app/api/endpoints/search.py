@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter
+from typing import List
+from ...db.search import search
+from ...db.session import get_async_db
+from ...models.user import User
+from ...schemas.search import SearchHit, MAX_SEARCH_RESULTS, MAX_SEARCH_OFFSET
+from ..cache import response_cache
+from backend.auth import get_current_active_user
+
+router = APIRouter()
+
+hit_list_adapter = TypeAdapter(List[SearchHit])
+
+@router.get("/", response_model=List[SearchHit])
+async def search_entries(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Ranked full-text search over the user's journal entries and tasks."""
+    cached = await response_cache.lookup(request, current_user.id)
+    if cached.response is not None:
+        return cached.response
+
+    hits = await db.run_sync(search, current_user.id, q, limit, offset)
+    return await cached.store(hit_list_adapter.dump_json(hit_list_adapter.validate_python(hits)))
\ No newline at end of file
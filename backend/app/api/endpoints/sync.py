@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Tuple
+from datetime import datetime
+import base64
+import json
+from ...db.session import get_async_db
+from ...db.sync import SYNCED_MODELS, SnapshotPosition, changes_since, snapshot_page
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...models.user import User
+from ...schemas.sync import SyncResponse
+from backend.auth import get_current_active_user
+
+router = APIRouter()
+
+def encode_sync_token(moment: datetime) -> str:
+    raw = json.dumps([moment.isoformat()]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_sync_token(token: str) -> datetime:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        (moment,) = json.loads(raw)
+        return datetime.fromisoformat(moment)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token",
+        )
+
+def encode_snapshot_cursor(started_at: datetime, position: SnapshotPosition) -> str:
+    table, updated_at, row_id = position
+    raw = json.dumps([
+        started_at.isoformat(), table, updated_at.isoformat() if updated_at is not None else None, row_id,
+    ]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_snapshot_cursor(cursor: str) -> Tuple[datetime, SnapshotPosition]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        started_at, table, updated_at, row_id = json.loads(raw)
+        if table not in SYNCED_MODELS:
+            raise ValueError(table)
+        if updated_at is not None:
+            updated_at = datetime.fromisoformat(updated_at)
+        return datetime.fromisoformat(started_at), (table, updated_at, int(row_id))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+@router.get("/", response_model=SyncResponse)
+async def sync(
+    since: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Tasks and goals created, updated or deleted since ``since``, the
+    ``token`` of an earlier sync; without it, a snapshot of everything,
+    ``limit`` rows per page. While ``more`` is set, fetch the rest of the
+    snapshot with ``cursor``; the last page carries the ``token``."""
+    if cursor:
+        started_at, after = decode_snapshot_cursor(cursor)
+        changes = await db.run_sync(snapshot_page, current_user.id, started_at, after, limit)
+    else:
+        since_at = decode_sync_token(since) if since else None
+        changes = await db.run_sync(changes_since, current_user.id, since_at, limit)
+    more = changes["next"] is not None
+    return SyncResponse.model_validate({
+        "token": None if more else encode_sync_token(changes["now"]),
+        "cursor": encode_snapshot_cursor(changes["now"], changes["next"]) if more else None,
+        "more": more,
+        "reset": changes["reset"],
+        "user": changes["user"],
+        "tasks": changes["tasks"],
+        "goals": changes["goals"],
+        "deleted": changes["deleted"],
+    }, from_attributes=True)
@@ -1,56 +1,321 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
-from ...db.session import get_db
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlalchemy import insert, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from types import SimpleNamespace
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from ...db.mutations import delete_owned, update_owned
+from ...db.outbox import cancel_reminder, schedule_reminder
+from ...db.points import complete_tasks
+from ...db.session import get_async_db
+from ...db.stats import record_task_change, record_task_changes, snapshot_task
+from ...db.sync import record_deletion
 from ...models.task import Task
-from ...schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from ...models.user import User
+from ...schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskBatchResult,
+    TaskRangeResponse,
+    MAX_RANGE_DAYS,
+)
+from ..cache import response_cache
+from ..events import change_feed
+from ..serialization import ListSerializer
+from ..pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    apply_keyset,
+    split_page,
+)
+from backend.auth import get_current_active_user, invalidate_cached_user
 
 router = APIRouter()
 
+task_serializer = ListSerializer(Task, TaskResponse)
+
+# Columns feeding the daily stats rollup and the reminder schedule.
+TRACKED_COLUMNS = (Task.id, Task.due_date, Task.is_completed, Task.points, Task.start_time)
+TRACKED_FIELDS = frozenset(("due_date", "points", "start_time"))
+
+BATCH_EVENTS = {"create": "created", "update": "updated", "complete": "completed"}
+
+async def get_user_task(db: AsyncSession, task_id: int, user_id: int) -> Task:
+    db_task = (await db.execute(
+        select(Task).where(Task.id == task_id, Task.user_id == user_id)
+    )).scalar_one_or_none()
+    if not db_task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return db_task
+
 @router.get("/", response_model=List[TaskResponse])
-def get_tasks(db: Session = Depends(get_db)):
-    return db.query(Task).all()
+async def get_tasks(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    cached = await response_cache.lookup(request, current_user.id)
+    if cached.response is not None:
+        return cached.response
+
+    query = apply_keyset(
+        task_serializer.select().where(Task.user_id == current_user.id),
+        Task.due_date, Task.id, cursor, limit
+    )
+    rows = task_serializer.all(await db.execute(query))
+    tasks, next_cursor = split_page(rows, limit, "due_date")
+    body = task_serializer.dump(tasks)
+    return await cached.store(body, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+
+RANGE_COLUMNS = (
+    Task.id, Task.title, Task.start_time, Task.end_time,
+    Task.is_completed, Task.points, Task.goal_id,
+)
+
+def as_utc_naive(value: datetime) -> datetime:
+    """Task times are stored as naive UTC; normalize client timestamps to match."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def task_range_query(user_id: int, start: datetime, end: datetime):
+    """Tasks overlapping ``[start, end)``, unordered.
+
+    The overlap test is split into two disjoint branches so each is a
+    range scan on one index: tasks starting inside the window use
+    ``(user_id, start_time)``, and tasks that started earlier but are
+    still running at ``start`` use ``(user_id, end_time)``. Ordering the
+    union in SQL would make SQLite read both branches through the
+    ``start_time`` index, so callers sort the (window-sized) result.
+    """
+    starts_inside = select(*RANGE_COLUMNS).where(
+        Task.user_id == user_id, Task.start_time >= start, Task.start_time < end
+    )
+    # SQLite rates a one-sided range on either index the same and would
+    # scan every earlier task through (user_id, start_time). The redundant
+    # upper bound makes the (user_id, end_time) scan, which only covers
+    # tasks ending after ``start``, look cheaper; calendars mostly show the
+    # present, where that range is short.
+    running_at_start = select(*RANGE_COLUMNS).where(
+        Task.user_id == user_id,
+        Task.end_time > start,
+        Task.end_time <= datetime.max,
+        Task.start_time < start,
+    )
+    return union_all(starts_inside, running_at_start)
+
+@router.get("/range", response_model=TaskRangeResponse)
+async def get_task_range(
+    request: Request,
+    start: datetime,
+    end: datetime,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Tasks whose ``[start_time, end_time]`` overlaps ``[start, end)``, for
+    calendar views, as a column-oriented payload."""
+    start, end = as_utc_naive(start), as_utc_naive(end)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if end - start > timedelta(days=MAX_RANGE_DAYS):
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_RANGE_DAYS} days")
+
+    cached = await response_cache.lookup(request, current_user.id)
+    if cached.response is not None:
+        return cached.response
+
+    query = task_range_query(current_user.id, start, end)
+    rows = sorted((await db.execute(query)).all(), key=lambda row: (row.start_time, row.id))
+
+    columns = dict(zip(query.selected_columns.keys(), zip(*rows))) if rows else {}
+    body = TaskRangeResponse(start=start, end=end, **columns).model_dump_json()
+    return await cached.store(body.encode())
 
 @router.post("/", response_model=TaskResponse)
-def create_task(task: TaskCreate, db: Session = Depends(get_db)):
-    db_task = Task(**task.dict())
+async def create_task(
+    task: TaskCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    db_task = Task(**task.dict(), user_id=current_user.id)
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await db.flush()
+    await db.run_sync(record_task_change, current_user.id, None, snapshot_task(db_task))
+    db.add(schedule_reminder(db_task.id, current_user.email, db_task.start_time))
+    await db.commit()
+    await response_cache.bump(current_user.id)
+    await db.refresh(db_task)
+    await change_feed.publish(current_user.id, "task", "created", db_task.id, db_task)
     return db_task
 
+@router.post("/batch", response_model=TaskBatchResponse)
+async def batch_tasks(
+    batch: TaskBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Apply many create/update/complete operations in one transaction.
+
+    Existing tasks are loaded with one SELECT, creates go out as one bulk
+    INSERT and all updates and completions as one bulk UPDATE by primary
+    key. Completions go through one conditional UPDATE, so tasks another
+    request completes meanwhile are not credited twice.
+    """
+    operations = batch.operations
+    results: List[Optional[TaskBatchResult]] = [None] * len(operations)
+
+    referenced = {op.id for op in operations if op.op != "create"}
+    existing = {}
+    if referenced:
+        rows = (await db.execute(
+            select(Task.id, Task.due_date, Task.start_time, Task.is_completed, Task.points)
+            .where(Task.user_id == current_user.id, Task.id.in_(referenced))
+        )).all()
+        existing = {row.id: dict(row._mapping) for row in rows}
+
+    now = datetime.utcnow()
+    state = {task_id: dict(values) for task_id, values in existing.items()}
+    changes = {}
+    completing = []
+    creates = []
+    reminders = []
+    for index, op in enumerate(operations):
+        if op.op == "create":
+            creates.append((index, {**op.task.dict(), "user_id": current_user.id}))
+            continue
+        if op.id not in state:
+            results[index] = TaskBatchResult(index=index, op=op.op, id=op.id, status=404, detail="Task not found")
+            continue
+        if op.op == "update":
+            values = op.task.dict(exclude_unset=True)
+            changes.setdefault(op.id, {}).update(values)
+        else:
+            values = {"is_completed": True}
+            changes.setdefault(op.id, {})
+            if not state[op.id]["is_completed"]:
+                completing.append(op.id)
+        state[op.id].update(values)
+        results[index] = TaskBatchResult(index=index, op=op.op, id=op.id, status=200)
+
+    if creates:
+        # Asking SQLAlchemy to sort RETURNING rows by parameter order makes
+        # it fall back to one INSERT per row on SQLite. Autoincrement keys
+        # are handed out in VALUES order, so sorting the ids is equivalent.
+        created_ids = sorted((await db.execute(
+            insert(Task).returning(Task.id),
+            [values for _, values in creates],
+        )).scalars().all())
+        for (index, values), task_id in zip(creates, created_ids):
+            results[index] = TaskBatchResult(index=index, op="create", id=task_id, status=201)
+            reminders.append(schedule_reminder(task_id, current_user.email, values["start_time"]))
+
+    updates = [{"id": task_id, **values} for task_id, values in changes.items() if values]
+    if updates:
+        await db.execute(update(Task), updates)
+    completed = await db.run_sync(complete_tasks, current_user.id, completing, now)
+    for task_id in completing:
+        if task_id not in completed:
+            # Completed by a concurrent request, which counted it already.
+            state[task_id]["is_completed"] = existing[task_id]["is_completed"]
+    points_awarded = sum(row.points or 0 for row in completed.values())
+    reminders += [
+        schedule_reminder(task_id, current_user.email, values["start_time"])
+        for task_id, values in changes.items()
+        if values.get("start_time") not in (None, existing[task_id]["start_time"])
+    ]
+    db.add_all(reminders)
+
+    rollup = [(None, snapshot_task(SimpleNamespace(is_completed=False, **values))) for _, values in creates]
+    rollup += [
+        (snapshot_task(SimpleNamespace(**existing[task_id])), snapshot_task(SimpleNamespace(**state[task_id])))
+        for task_id in changes
+    ]
+    await db.run_sync(record_task_changes, current_user.id, rollup)
+    await db.commit()
+    if points_awarded:
+        invalidate_cached_user(current_user.email)
+    await response_cache.bump(current_user.id)
+    changed = dict.fromkeys(
+        (BATCH_EVENTS[result.op], result.id) for result in results
+        if result.status < 400 and (result.op != "complete" or result.id in completed)
+    )
+    for op, task_id in changed:
+        await change_feed.publish(current_user.id, "task", op, task_id)
+    return TaskBatchResponse(results=results, points_awarded=points_awarded)
+
 @router.put("/{task_id}", response_model=TaskResponse)
-def update_task(task_id: int, task: TaskUpdate, db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
+async def update_task(
+    task_id: int,
+    task: TaskUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    values = task.dict(exclude_unset=True)
+
+    previous = None
+    if TRACKED_FIELDS.intersection(values):
+        # The rollup and reminders need the values being replaced.
+        previous = (await db.execute(
+            select(*TRACKED_COLUMNS).where(Task.id == task_id, Task.user_id == current_user.id).with_for_update()
+        )).first()
+        if previous is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+    row = await db.run_sync(update_owned, Task, task_id, current_user.id, values)
+    if row is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    for key, value in task.dict(exclude_unset=True).items():
-        setattr(db_task, key, value)
-    
-    db.commit()
-    db.refresh(db_task)
-    return db_task
+    if previous is not None:
+        await db.run_sync(record_task_change, current_user.id, snapshot_task(previous), snapshot_task(row))
+        if row.start_time != previous.start_time:
+            db.add(schedule_reminder(row.id, current_user.email, row.start_time))
+
+    await db.commit()
+    await response_cache.bump(current_user.id)
+    await change_feed.publish(current_user.id, "task", "updated", row.id, row)
+    return row
 
 @router.delete("/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
+async def delete_task(
+    task_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    row = await db.run_sync(delete_owned, Task, task_id, current_user.id, *TRACKED_COLUMNS)
+    if row is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    db.delete(db_task)
-    db.commit()
+
+    await db.run_sync(record_task_change, current_user.id, snapshot_task(row), None)
+    db.add(cancel_reminder(task_id, current_user.email))
+    db.add(record_deletion(current_user.id, Task, task_id))
+    await db.commit()
+    await response_cache.bump(current_user.id)
+    await change_feed.publish(current_user.id, "task", "deleted", task_id)
     return {"message": "Task deleted successfully"}
 
 @router.put("/{task_id}/complete", response_model=TaskResponse)
-def complete_task(task_id: int, db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
-    db_task.is_completed = True
-    db_task.completed_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_task)
-    return db_task 
\ No newline at end of file
+async def complete_task(
+    task_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    completed = await db.run_sync(complete_tasks, current_user.id, [task_id], datetime.utcnow())
+    row = completed.get(task_id)
+    if row is None:
+        # Already completed, e.g. a retry, or not the user's task.
+        return await get_user_task(db, task_id, current_user.id)
+
+    after = snapshot_task(row)
+    if after is not None:
+        before = (after[0], False, after[2])
+        await db.run_sync(record_task_change, current_user.id, before, after)
+    await db.commit()
+    if row.points:
+        invalidate_cached_user(current_user.email)
+    await response_cache.bump(current_user.id)
+    await change_feed.publish(current_user.id, "task", "completed", row.id, row)
+    return row
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""Per-user change feed behind the ``/api/events`` stream.
+
+Task, goal and journal writes publish a compact event after they commit::
+
+    {"type": "task", "op": "updated", "id": 42, "data": {...}}
+
+``op`` is one of ``created``, ``updated``, ``completed`` or ``deleted``.
+``data`` is the row rendered through ``EVENT_SCHEMAS``, the same shape
+whichever router wrote it, when the write had it at hand; events without it (deletes and batch writes) mean the
+client should drop the row or refetch it. A subscriber that falls more
+than ``CHANGE_FEED_QUEUE_SIZE`` events behind, or misses events while
+Redis is unreachable, gets a single ``resync`` event instead and should
+refetch everything.
+
+Events are delivered within the process by default, which is only
+correct with a single worker. Set ``CHANGE_FEED_REDIS_URL`` to fan them
+out to every worker through one Redis pub/sub channel. ``publish`` is a
+coroutine so that the Redis backend does not block the event loop; sync
+endpoints reach it through ``anyio.from_thread.run``.
+"""
+from typing import Dict, Optional, Set
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+
+from ..schemas import GoalResponse, JournalResponse, TaskResponse
+
+CHANGE_FEED_REDIS_URL = os.getenv("CHANGE_FEED_REDIS_URL")
+CHANGE_FEED_CHANNEL = os.getenv("CHANGE_FEED_CHANNEL", "productivity_plus:changes")
+CHANGE_FEED_QUEUE_SIZE = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "256"))
+
+RESYNC = json.dumps({"type": "resync"}, separators=(",", ":"))
+
+EVENT_SCHEMAS = {"task": TaskResponse, "goal": GoalResponse, "journal": JournalResponse}
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """One open stream: a bounded queue fed from any thread."""
+
+    def __init__(self, user_id: int, maxsize: int = CHANGE_FEED_QUEUE_SIZE):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def offer(self, message: str) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # The event loop is gone; the stream is being torn down.
+            pass
+
+    def _put(self, message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind to catch up event by event.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self) -> str:
+        return await self.queue.get()
+
+class MemoryBackend:
+    """Delivers events to the streams open in this process."""
+
+    def __init__(self):
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def listening(self, user_id: int) -> bool:
+        return user_id in self._subscriptions
+
+    async def publish(self, user_id: int, message: str) -> None:
+        self.deliver(user_id, message)
+
+    def deliver(self, user_id: int, message: str) -> None:
+        """Hand ``message`` to ``user_id``'s streams; callable from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.offer(message)
+
+    def broadcast(self, message: str) -> None:
+        with self._lock:
+            subscriptions = [s for group in self._subscriptions.values() for s in group]
+        for subscription in subscriptions:
+            subscription.offer(message)
+
+    def subscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.setdefault(subscription.user_id, set()).add(subscription)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            group = self._subscriptions.get(subscription.user_id)
+            if group is not None:
+                group.discard(subscription)
+                if not group:
+                    del self._subscriptions[subscription.user_id]
+
+class RedisBackend:
+    """Publishes to a Redis channel that every worker relays to its own streams.
+
+    Each worker listens on a daemon thread started with its first stream;
+    write endpoints publish through an asyncio client.
+    """
+
+    def __init__(self, url: str, channel: str = CHANGE_FEED_CHANNEL):
+        import redis
+        from redis import asyncio as aioredis
+
+        self.client = redis.Redis.from_url(url)
+        self.async_client = aioredis.Redis.from_url(url)
+        self.channel = channel
+        self.local = MemoryBackend()
+        self._listener: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def listening(self, user_id: int) -> bool:
+        # Streams for this user may be open on any worker.
+        return True
+
+    async def publish(self, user_id: int, message: str) -> None:
+        await self.async_client.publish(self.channel, f"{user_id}:{message}")
+
+    def subscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="change-feed", daemon=True)
+                self._listener.start()
+        self.local.subscribe(subscription)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.local.unsubscribe(subscription)
+
+    def _listen(self) -> None:
+        import redis
+
+        connected_before = False
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                if connected_before:
+                    # Whatever was published while disconnected is lost.
+                    self.local.broadcast(RESYNC)
+                connected_before = True
+                for item in pubsub.listen():
+                    try:
+                        user_id, _, message = item["data"].decode().partition(":")
+                        user_id = int(user_id)
+                    except (AttributeError, KeyError, ValueError):
+                        # Someone else's message on the channel; keep listening.
+                        logger.exception("Change feed dropped a malformed message: %r", item)
+                        continue
+                    self.local.deliver(user_id, message)
+            except redis.RedisError:
+                logger.exception("Change feed lost its Redis subscription, reconnecting")
+                time.sleep(1)
+
+class ChangeFeed:
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def publish(self, user_id: int, kind: str, op: str, row_id: int, row=None) -> None:
+        """Tell ``user_id``'s open streams that a row changed. Call after commit.
+
+        ``row`` is rendered through ``EVENT_SCHEMAS[kind]`` only if someone
+        may be listening, so writes by users with no open stream stay cheap.
+        """
+        if not self.backend.listening(user_id):
+            return
+        event = {"type": kind, "op": op, "id": row_id}
+        if row is not None:
+            schema = EVENT_SCHEMAS[kind]
+            event["data"] = schema.model_validate(row, from_attributes=True).model_dump(mode="json")
+        await self.backend.publish(user_id, json.dumps(event, separators=(",", ":")))
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id)
+        self.backend.subscribe(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.backend.unsubscribe(subscription)
+
+change_feed = ChangeFeed(
+    RedisBackend(CHANGE_FEED_REDIS_URL) if CHANGE_FEED_REDIS_URL else MemoryBackend()
+)
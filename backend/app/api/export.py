@@ -0,0 +1,101 @@
+"""Streaming export of a user's account.
+
+Each table is read with ``AsyncSession.stream`` and ``yield_per``: a
+server-side cursor on drivers that have one, batched fetches of
+``EXPORT_BATCH_SIZE`` rows elsewhere. Every batch is encoded, optionally
+gzip-compressed, and handed to the response before the next one is
+fetched, so memory stays flat however many rows an account holds.
+
+Rows are not sorted: ordering millions of them would make the database
+sort the whole table before sending the first one. NDJSON exports the
+whole account, one object per line tagged with its ``type``, starting
+with the user. CSV holds one resource per file.
+"""
+from datetime import date, datetime
+from enum import Enum
+from typing import AsyncIterator, Optional, Sequence
+import csv
+import io
+import json
+import os
+import zlib
+
+from sqlalchemy import select
+
+from ..db.session import AsyncSessionLocal
+from ..models import Goal, Journal, Task, User
+from .serialization import orjson
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+EXPORTED_MODELS = {"tasks": Task, "goals": Goal, "journals": Journal}
+# Singular ``type`` of each NDJSON line.
+RECORD_TYPES = {"tasks": "task", "goals": "goal", "journals": "journal"}
+
+USER_COLUMNS = tuple(column for column in User.__table__.columns if column.key != "hashed_password")
+
+def export_columns(model) -> tuple:
+    """Every column but the owner, which is the same on every row."""
+    return tuple(column for column in model.__table__.columns if column.key != "user_id")
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+def _json_line(record: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(record, separators=(",", ":"), default=_plain).encode() + b"\n"
+
+def ndjson_lines(record_type: str, rows: Sequence) -> bytes:
+    return b"".join(_json_line({"type": record_type, **row._mapping}) for row in rows)
+
+def csv_lines(rows: Sequence, header: Optional[Sequence[str]] = None) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+async def stream_batches(db, model, user_id: int) -> AsyncIterator[Sequence]:
+    result = await db.stream(
+        select(*export_columns(model))
+        .where(model.user_id == user_id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    async for batch in result.partitions():
+        yield batch
+
+async def export_ndjson(user_id: int, resource: Optional[str] = None) -> AsyncIterator[bytes]:
+    """The user's record followed by every row of ``resource``, or of
+    every exported table, as NDJSON."""
+    resources = [resource] if resource else list(EXPORTED_MODELS)
+    # A session of its own, opened once the body starts and closed when it ends.
+    async with AsyncSessionLocal() as db:
+        if resource is None:
+            user = (await db.execute(select(*USER_COLUMNS).where(User.id == user_id))).one()
+            yield ndjson_lines("user", [user])
+        for name in resources:
+            async for batch in stream_batches(db, EXPORTED_MODELS[name], user_id):
+                yield ndjson_lines(RECORD_TYPES[name], batch)
+
+async def export_csv(user_id: int, resource: str) -> AsyncIterator[bytes]:
+    """Every row of ``resource`` as CSV with a header line."""
+    model = EXPORTED_MODELS[resource]
+    yield csv_lines([], [column.key for column in export_columns(model)])
+    async with AsyncSessionLocal() as db:
+        async for batch in stream_batches(db, model, user_id):
+            yield csv_lines(batch)
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream into one gzip member as it is produced."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
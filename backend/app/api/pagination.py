@@ -0,0 +1,63 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(sort_value: Optional[datetime], row_id: int) -> str:
+    raw = json.dumps([sort_value.isoformat() if sort_value is not None else None, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        if sort_value is not None:
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+def apply_keyset(query, sort_column, id_column, cursor: Optional[str], limit: int):
+    """Restrict a Query/Select to the page after ``cursor``.
+
+    Rows are ordered by ``(sort_column, id_column)`` so the scan can start
+    directly at the cursor position instead of skipping earlier rows. One
+    extra row is fetched to detect whether another page follows.
+
+    Rows whose sort value is NULL, which only nullable columns such as
+    ``journals.date`` can have, come first, ordered by id.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if sort_value is None:
+            query = query.filter(or_(
+                and_(sort_column.is_(None), id_column > row_id),
+                sort_column.isnot(None),
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id),
+            ))
+    # SQLite sorts NULLs first by default, PostgreSQL last; spell it out so
+    # the cursor conditions above match the order on both.
+    order = sort_column.nullsfirst() if sort_column.nullable else sort_column
+    return query.order_by(order, id_column).limit(limit + 1)
+
+def split_page(rows: Sequence[Any], limit: int, sort_attr: str) -> Tuple[List[Any], Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page."""
+    items = list(rows[:limit])
+    if len(rows) <= limit:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor(getattr(last, sort_attr), last.id)
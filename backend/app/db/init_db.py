@@ -1,7 +1,19 @@
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
+import logging
 from .base_class import Base
+from .search import install_search_index
 from .session import engine
-from ..models import task  # Import all models here
+from .. import models  # Import all models here
+
+logger = logging.getLogger(__name__)
 
 def init_db() -> None:
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    try:
+        with engine.begin() as connection:
+            install_search_index(connection)
+    except OperationalError as exc:
+        # create_all does not add columns to existing tables, so databases
+        # from before tasks had user_id need `alembic upgrade head` first.
+        logger.warning("Full-text search index not installed: %s", exc.orig)
\ No newline at end of file
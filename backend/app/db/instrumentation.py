@@ -0,0 +1,91 @@
+"""Per-request SQL statistics and the slow-query log.
+
+Cursor events on every engine from ``session.py`` time each statement.
+While a request is being handled (see ``track_queries``), its statement
+count, total database time and slowest statement are accumulated on a
+``QueryStats`` held in a context variable, which the middleware in
+``backend/main.py`` turns into a ``Server-Timing`` header. Statements
+slower than ``SLOW_QUERY_THRESHOLD_MS`` are logged whether or not a
+request is active, with parameter values replaced by their types.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+import logging
+import os
+import time
+
+from sqlalchemy import event
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+MAX_LOGGED_STATEMENT_LENGTH = 2000
+
+logger = logging.getLogger(__name__)
+
+class QueryStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def add(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` value: total database time and the slowest statement."""
+        return (
+            f'db;dur={self.total_ms:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_ms:.1f}"
+        )
+
+# Mutated in place, never re-set, so statements run in threadpool workers
+# (which get a copy of the context) still count towards the request.
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statistics for the statements executed inside the block."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+def redact(parameters, executemany: bool) -> str:
+    """Parameter types without their values, safe to log."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return repr({name: type(value).__name__ for name, value in parameters.items()})
+    return repr([type(value).__name__ for value in parameters or ()])
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_started"].pop()) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.add(statement, elapsed_ms)
+    if elapsed_ms >= SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "Slow query (%.1fms): %s; parameters: %s",
+            elapsed_ms, statement[:MAX_LOGGED_STATEMENT_LENGTH], redact(parameters, executemany),
+        )
+
+def _discard_timer(exception_context):
+    # A statement that raised never reaches after_cursor_execute.
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+def instrument(engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _discard_timer)
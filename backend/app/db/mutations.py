@@ -0,0 +1,43 @@
+"""Single-statement updates and deletes of rows owned by a user.
+
+``UPDATE ... WHERE id = :id AND user_id = :user_id RETURNING ...`` both
+checks ownership and hands back the new row, replacing the SELECT before
+and the refresh after an ORM update; ``DELETE ... RETURNING`` does the
+same for deletes. Backends without RETURNING get the same results from
+an extra SELECT.
+"""
+from typing import Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+def _owned(model, row_id: int, user_id: int):
+    return model.id == row_id, model.user_id == user_id
+
+def update_owned(db: Session, model, row_id: int, user_id: int, values: dict) -> Optional[Row]:
+    """Apply ``values`` to ``user_id``'s row ``row_id`` and return the row
+    with every column as updated, or None if there is no such row."""
+    criteria = _owned(model, row_id, user_id)
+    columns = model.__table__.columns
+    if not values:
+        return db.execute(select(*columns).where(*criteria)).first()
+    statement = update(model).where(*criteria).values(**values).execution_options(synchronize_session=False)
+    if db.get_bind().dialect.update_returning:
+        return db.execute(statement.returning(*columns)).first()
+    if db.execute(statement).rowcount == 0:
+        return None
+    return db.execute(select(*columns).where(*criteria)).first()
+
+def delete_owned(db: Session, model, row_id: int, user_id: int, *columns) -> Optional[Row]:
+    """Delete ``user_id``'s row ``row_id`` and return ``columns`` (the id by
+    default) as they were, or None if there is no such row."""
+    criteria = _owned(model, row_id, user_id)
+    columns = columns or (model.id,)
+    statement = delete(model).where(*criteria).execution_options(synchronize_session=False)
+    if db.get_bind().dialect.delete_returning:
+        return db.execute(statement.returning(*columns)).first()
+    row = db.execute(select(*columns).where(*criteria).with_for_update()).first()
+    if row is not None:
+        db.execute(statement)
+    return row
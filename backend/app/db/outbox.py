@@ -0,0 +1,115 @@
+"""Transactional outbox and time-bucketed store for task reminders.
+
+Request handlers only add a ``reminder_outbox`` row in the same
+transaction as the task write. A periodic sweep folds the outbox into
+``scheduled_reminders`` (one row per task, indexed by ``remind_at``) and
+then claims the reminders due within the next window, so the worker only
+ever holds the reminders that are about to fire.
+"""
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from ..models.reminder import ReminderOutbox, ScheduledReminder
+
+REMINDER_LEAD_TIME = timedelta(minutes=15)
+# Overdue entries are still scheduled, so the sweep fires them late: their
+# time may pass before the next sweep, or while beat or the worker is down.
+# Only entries overdue by more than this are dropped.
+REMINDER_GRACE_PERIOD = timedelta(hours=6)
+
+SCHEDULE = "schedule"
+CANCEL = "cancel"
+
+reminders_table = ScheduledReminder.__table__
+
+def reminder_time(start_time: datetime) -> datetime:
+    return start_time - REMINDER_LEAD_TIME
+
+def schedule_reminder(task_id: int, user_email: str, start_time: datetime) -> ReminderOutbox:
+    """Outbox row (re)scheduling a task's reminder, or cancelling it if already past."""
+    remind_at = reminder_time(start_time)
+    if remind_at <= datetime.utcnow():
+        return cancel_reminder(task_id, user_email)
+    return ReminderOutbox(task_id=task_id, user_email=user_email, action=SCHEDULE, remind_at=remind_at)
+
+def cancel_reminder(task_id: int, user_email: str) -> ReminderOutbox:
+    return ReminderOutbox(task_id=task_id, user_email=user_email, action=CANCEL)
+
+def _upsert_reminders(db: Session, rows: List[dict]) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(reminders_table)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[reminders_table.c.task_id],
+            set_={
+                "user_email": stmt.excluded.user_email,
+                "remind_at": stmt.excluded.remind_at,
+            },
+        ), rows)
+        return
+
+    db.execute(delete(reminders_table).where(
+        reminders_table.c.task_id.in_([row["task_id"] for row in rows])
+    ))
+    db.execute(reminders_table.insert(), rows)
+
+def apply_outbox(db: Session, batch_size: int) -> int:
+    """Fold one batch of outbox rows into ``scheduled_reminders``.
+
+    Only the newest entry per task counts, and one already due is kept for
+    ``claim_due_reminders`` to fire unless it is past the grace period.
+    The consumed rows are deleted; the caller commits. Returns the number of outbox rows consumed.
+    """
+    rows = (
+        db.query(ReminderOutbox)
+        .order_by(ReminderOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not rows:
+        return 0
+    latest = {}
+    for row in rows:
+        latest[row.task_id] = row
+
+    stale = datetime.utcnow() - REMINDER_GRACE_PERIOD
+    live = [
+        {"task_id": row.task_id, "user_email": row.user_email, "remind_at": row.remind_at}
+        for row in latest.values()
+        if row.action == SCHEDULE and row.remind_at > stale
+    ]
+    dropped = [task_id for task_id, row in latest.items() if row.action != SCHEDULE or row.remind_at <= stale]
+    if dropped:
+        db.execute(delete(reminders_table).where(reminders_table.c.task_id.in_(dropped)))
+    if live:
+        _upsert_reminders(db, live)
+    db.execute(delete(ReminderOutbox).where(ReminderOutbox.id.in_([row.id for row in rows])))
+    return len(rows)
+
+def claim_due_reminders(db: Session, horizon: datetime, batch_size: int) -> list:
+    """Remove and return up to ``batch_size`` reminders due before ``horizon``.
+
+    Returns ``(task_id, user_email, remind_at)`` rows. The caller commits
+    after handing them to the broker, so a crash in between leaves them in
+    place for the next sweep.
+    """
+    due = db.execute(
+        select(reminders_table)
+        .where(reminders_table.c.remind_at < horizon)
+        .order_by(reminders_table.c.remind_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if due:
+        db.execute(delete(reminders_table).where(
+            reminders_table.c.task_id.in_([row.task_id for row in due])
+        ))
+    return due
@@ -0,0 +1,71 @@
+"""Task completion and the points ledger.
+
+Completing a task is a single conditional UPDATE that only matches tasks
+not yet completed, so whichever of several concurrent or retried
+requests gets there first completes the task and the others match
+nothing. Only tasks that UPDATE completed earn points: each gets an
+append-only ``points_ledger`` row, and the balance in ``users.points``
+moves by one atomic ``points = points + :delta``, so it never depends on
+a value read earlier in the request.
+"""
+from datetime import datetime
+from typing import Dict, Iterable
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ..models import PointsLedger, Task, User
+
+TASK_COMPLETED = "task_completed"
+OPENING_BALANCE = "opening_balance"
+
+def complete_tasks(db: Session, user_id: int, task_ids: Iterable[int], completed_at: datetime) -> Dict[int, Row]:
+    """Complete ``user_id``'s tasks among ``task_ids`` that are still open
+    and credit their points.
+
+    Returns the completed rows, every column as updated, keyed by id, for
+    the tasks this call completed; tasks that are missing, belong to
+    someone else or were already completed are left out and earn nothing.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return {}
+    open_tasks = (Task.user_id == user_id, Task.id.in_(task_ids), Task.is_completed.isnot(True))
+    columns = Task.__table__.columns
+    completion = (
+        update(Task)
+        .where(*open_tasks)
+        .values(is_completed=True, completed_at=completed_at)
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.update_returning:
+        rows = db.execute(completion.returning(*columns)).all()
+    else:
+        # Lock the open tasks so the UPDATE completes exactly these.
+        ids = db.execute(select(Task.id).where(*open_tasks).with_for_update()).scalars().all()
+        rows = []
+        if ids:
+            db.execute(completion.where(Task.id.in_(ids)))
+            rows = db.execute(select(*columns).where(Task.id.in_(ids))).all()
+    credit_points(db, user_id, [(row.id, row.points or 0) for row in rows], TASK_COMPLETED)
+    return {row.id: row for row in rows}
+
+def credit_points(db: Session, user_id: int, entries: Iterable, reason: str) -> int:
+    """Append ``(task_id, delta)`` entries to the ledger and add their total
+    to the user's balance. Returns the total."""
+    rows = [
+        {"user_id": user_id, "task_id": task_id, "delta": delta, "reason": reason}
+        for task_id, delta in entries if delta
+    ]
+    if not rows:
+        return 0
+    total = sum(row["delta"] for row in rows)
+    db.execute(insert(PointsLedger), rows)
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(points=User.points + total)
+        .execution_options(synchronize_session=False)
+    )
+    return total
@@ -0,0 +1,48 @@
+"""Count the statements an engine executes, for query-count regression checks.
+
+    with assert_max_queries(engine, 2):
+        client.get("/goals/", headers=auth)
+
+fails with the offending statements listed when the block runs more than
+two queries, so an N+1 introduced by a new lazy relationship shows up as
+a failure instead of a slowdown. Async engines are accepted as well.
+"""
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import event
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+    def report(self) -> str:
+        return "\n".join(f"{n}. {statement}" for n, statement in enumerate(self.statements, 1))
+
+@contextmanager
+def count_queries(engine) -> Iterator[QueryCounter]:
+    """Record every statement ``engine`` executes inside the block."""
+    engine = getattr(engine, "sync_engine", engine)
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+@contextmanager
+def assert_max_queries(engine, limit: int) -> Iterator[QueryCounter]:
+    """Fail if the block executes more than ``limit`` statements on ``engine``."""
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > limit:
+        raise AssertionError(
+            f"expected at most {limit} queries, got {counter.count}:\n{counter.report()}"
+        )
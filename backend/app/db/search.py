@@ -0,0 +1,276 @@
+"""Full-text search over journal entries and task titles/descriptions.
+
+On SQLite a single FTS5 table, ``search_index``, holds one row per task
+and journal entry and is kept in sync by triggers on both tables. The
+rowid packs the owner into its high 32 bits and the source row into the
+low ones (``2 * id`` for tasks, ``2 * id + 1`` for journals), so each
+user's entries form one contiguous rowid range. A search constrains the
+match to that range, which FTS5 applies inside every posting list, and
+triggers update and delete by rowid instead of scanning the index.
+
+On Postgres each table gets a generated ``search_vector`` column with a
+GIN index; the database keeps it current on every write.
+
+Rebuild the index from scratch with:
+
+    python -m backend.app.db.search
+"""
+from typing import List, Optional
+import argparse
+import html
+import os
+import re
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+MAX_SEARCH_TERMS = 8
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+# The database brackets matches with these private-use characters instead;
+# they survive HTML escaping and become the tags above afterwards.
+MATCH_OPEN = "\ue000"
+MATCH_CLOSE = "\ue001"
+SNIPPET_TOKENS = 16
+# Title matches outweigh body matches.
+SQLITE_RANK = "bm25(search_index, 4.0, 1.0)"
+# bm25 gets each term's document frequency by reading its posting list
+# across all users. When a term is estimated (from its share of the user's
+# own entries) to occur in more documents than this, that read costs more
+# than the search itself, so such queries list the newest matches first.
+MAX_RANKED_DOCUMENTS = int(os.getenv("SEARCH_MAX_RANKED_DOCUMENTS", "50000"))
+INDEX_SIZE_TTL_SECONDS = 300
+
+# rowid of a task or journal row in search_index; see the module docstring.
+TASK_ROWID = "(coalesce({row}.user_id, 0) << 32) + {row}.id * 2"
+JOURNAL_ROWID = "(coalesce({row}.user_id, 0) << 32) + {row}.id * 2 + 1"
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "title, body, tokenize = 'porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_search_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO search_index (rowid, title, body) "
+    f"VALUES ({TASK_ROWID.format(row='new')}, new.title, coalesce(new.description, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_search_update AFTER UPDATE OF title, description, user_id ON tasks BEGIN "
+    f"DELETE FROM search_index WHERE rowid = {TASK_ROWID.format(row='old')}; "
+    "INSERT INTO search_index (rowid, title, body) "
+    f"VALUES ({TASK_ROWID.format(row='new')}, new.title, coalesce(new.description, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_search_delete AFTER DELETE ON tasks BEGIN "
+    f"DELETE FROM search_index WHERE rowid = {TASK_ROWID.format(row='old')}; END",
+    "CREATE TRIGGER IF NOT EXISTS journals_search_insert AFTER INSERT ON journals BEGIN "
+    "INSERT INTO search_index (rowid, title, body) "
+    f"VALUES ({JOURNAL_ROWID.format(row='new')}, '', coalesce(new.content, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS journals_search_update AFTER UPDATE OF content, user_id ON journals BEGIN "
+    f"DELETE FROM search_index WHERE rowid = {JOURNAL_ROWID.format(row='old')}; "
+    "INSERT INTO search_index (rowid, title, body) "
+    f"VALUES ({JOURNAL_ROWID.format(row='new')}, '', coalesce(new.content, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS journals_search_delete AFTER DELETE ON journals BEGIN "
+    f"DELETE FROM search_index WHERE rowid = {JOURNAL_ROWID.format(row='old')}; END",
+)
+
+SQLITE_BACKFILL = (
+    "DELETE FROM search_index",
+    "INSERT INTO search_index (rowid, title, body) "
+    f"SELECT {TASK_ROWID.format(row='tasks')}, title, coalesce(description, '') FROM tasks",
+    "INSERT INTO search_index (rowid, title, body) "
+    f"SELECT {JOURNAL_ROWID.format(row='journals')}, '', coalesce(content, '') FROM journals",
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS tasks_search_insert",
+    "DROP TRIGGER IF EXISTS tasks_search_update",
+    "DROP TRIGGER IF EXISTS tasks_search_delete",
+    "DROP TRIGGER IF EXISTS journals_search_insert",
+    "DROP TRIGGER IF EXISTS journals_search_update",
+    "DROP TRIGGER IF EXISTS journals_search_delete",
+    "DROP TABLE IF EXISTS search_index",
+)
+
+POSTGRES_DDL = (
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING gin (search_vector)",
+    "ALTER TABLE journals ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "to_tsvector('english', coalesce(content, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_journals_search_vector ON journals USING gin (search_vector)",
+)
+
+POSTGRES_DROP = (
+    "DROP INDEX IF EXISTS ix_journals_search_vector",
+    "ALTER TABLE journals DROP COLUMN IF EXISTS search_vector",
+    "DROP INDEX IF EXISTS ix_tasks_search_vector",
+    "ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector",
+)
+
+SQLITE_SEARCH = """
+SELECT rowid,
+       highlight(search_index, 0, :open, :close) AS title,
+       snippet(search_index, 1, :open, :close, '…', :tokens) AS snippet,
+       {rank} AS rank
+FROM search_index
+WHERE search_index MATCH :match AND rowid BETWEEN :first AND :last
+ORDER BY {order}
+LIMIT :limit OFFSET :offset
+"""
+
+SQLITE_INDEX_SIZE = "SELECT count(*) FROM search_index_docsize"
+SQLITE_COUNT = "SELECT count(*) FROM search_index WHERE rowid BETWEEN :first AND :last"
+SQLITE_COUNT_MATCHES = (
+    "SELECT count(*) FROM search_index "
+    "WHERE search_index MATCH :match AND rowid BETWEEN :first AND :last"
+)
+
+# Headlines are only built for the page that is returned.
+POSTGRES_SEARCH = """
+SELECT hits.kind, hits.id,
+       nullif(ts_headline('english', hits.title, query, :options), '') AS title,
+       ts_headline('english', hits.body, query, :options) AS snippet,
+       hits.rank
+FROM (
+    SELECT 'task' AS kind, id, title, coalesce(description, '') AS body,
+           ts_rank(search_vector, to_tsquery('english', :match)) AS rank
+    FROM tasks
+    WHERE user_id = :user_id AND search_vector @@ to_tsquery('english', :match)
+    UNION ALL
+    SELECT 'journal', id, '', coalesce(content, ''),
+           ts_rank(search_vector, to_tsquery('english', :match))
+    FROM journals
+    WHERE user_id = :user_id AND search_vector @@ to_tsquery('english', :match)
+    ORDER BY rank DESC
+    LIMIT :limit OFFSET :offset
+) hits, to_tsquery('english', :match) query
+ORDER BY hits.rank DESC
+"""
+
+TERM = re.compile(r"\w+")
+
+_index_size = (float("-inf"), 0)
+
+def search_terms(query: str) -> List[str]:
+    """Words of a user query; operators and quotes are dropped so input can
+    never be parsed as FTS syntax."""
+    return TERM.findall(query)[:MAX_SEARCH_TERMS]
+
+def render_highlights(value: Optional[str]) -> Optional[str]:
+    """HTML-escape highlighted user text, then mark the matches."""
+    if value is None:
+        return None
+    return html.escape(value).replace(MATCH_OPEN, HIGHLIGHT_OPEN).replace(MATCH_CLOSE, HIGHLIGHT_CLOSE)
+
+def index_size(db: Session) -> int:
+    """Rows in the SQLite index, recounted at most every few minutes."""
+    global _index_size
+    counted_at, rows = _index_size
+    if time.monotonic() - counted_at > INDEX_SIZE_TTL_SECONDS:
+        rows = db.execute(text(SQLITE_INDEX_SIZE)).scalar()
+        _index_size = (time.monotonic(), rows)
+    return rows
+
+def install_search_index(connection) -> None:
+    """Create the search index for the connection's dialect if missing.
+
+    Safe to run on every start. A newly created SQLite index is backfilled
+    from existing rows; Postgres fills generated columns itself.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+        )).first()
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        if not exists:
+            for statement in SQLITE_BACKFILL:
+                connection.execute(text(statement))
+    elif dialect == "postgresql":
+        for statement in POSTGRES_DDL:
+            connection.execute(text(statement))
+
+def drop_search_index(connection) -> None:
+    dialect = connection.dialect.name
+    statements = {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP}.get(dialect, ())
+    for statement in statements:
+        connection.execute(text(statement))
+
+def rebuild_search_index(connection) -> None:
+    """Repopulate the SQLite index from the source tables."""
+    if connection.dialect.name == "sqlite":
+        install_search_index(connection)
+        for statement in SQLITE_BACKFILL:
+            connection.execute(text(statement))
+
+def search(db: Session, user_id: int, query: str, limit: int, offset: int = 0) -> List[dict]:
+    """Ranked matches for ``query`` among ``user_id``'s tasks and journals.
+
+    Every word must match after stemming, so "gardening" finds "garden".
+    Returns dicts with ``kind`` ("task" or "journal"), ``id``, ``title``
+    and ``snippet`` as escaped HTML with matches in ``<mark>``, and ``rank`` (higher is better; 0 for every
+    hit when SQLite falls back to newest first, see
+    ``MAX_RANKED_DOCUMENTS``).
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    params = {"user_id": user_id, "limit": limit, "offset": offset}
+
+    if db.get_bind().dialect.name == "postgresql":
+        params["match"] = " & ".join(terms)
+        params["options"] = (
+            f"StartSel={MATCH_OPEN}, StopSel={MATCH_CLOSE}, "
+            f"MaxWords={SNIPPET_TOKENS * 2}, MinWords={SNIPPET_TOKENS // 2}"
+        )
+        return [
+            {
+                **row._mapping,
+                "title": render_highlights(row.title),
+                "snippet": render_highlights(row.snippet),
+            }
+            for row in db.execute(text(POSTGRES_SEARCH), params)
+        ]
+
+    phrases = [f'"{term}"' for term in terms]
+    user_range = {"first": user_id << 32, "last": ((user_id + 1) << 32) - 1}
+    common = False
+    total = index_size(db)
+    if total > MAX_RANKED_DOCUMENTS:
+        entries = db.execute(text(SQLITE_COUNT), user_range).scalar()
+        common = any(
+            db.execute(text(SQLITE_COUNT_MATCHES), {**user_range, "match": phrase}).scalar() * total
+            > MAX_RANKED_DOCUMENTS * entries
+            for phrase in phrases
+        )
+    statement = SQLITE_SEARCH.format(
+        rank="0.0" if common else SQLITE_RANK,
+        order="rowid DESC" if common else "rank",
+    )
+    params.update(
+        user_range,
+        match=" ".join(phrases),
+        open=MATCH_OPEN,
+        close=MATCH_CLOSE,
+        tokens=SNIPPET_TOKENS,
+    )
+    return [
+        {
+            "kind": "journal" if row.rowid & 1 else "task",
+            "id": (row.rowid & 0xFFFFFFFF) >> 1,
+            "title": render_highlights(row.title or None),
+            "snippet": render_highlights(row.snippet),
+            "rank": -row.rank,
+        }
+        for row in db.execute(text(statement), params)
+    ]
+
+def main() -> None:
+    from .session import engine
+
+    parser = argparse.ArgumentParser(description="Rebuild the full-text search index.")
+    parser.parse_args()
+
+    with engine.begin() as connection:
+        rebuild_search_index(connection)
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,118 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from dotenv import load_dotenv
 import os
 
+from ..metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, instrument_pool
+from .instrumentation import instrument
+
+load_dotenv()
+
+# The default is a fresh local file that init_db() builds with create_all().
+# The committed productivity_plus.db predates tasks.user_id and journals.
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+# Pool settings apply to every file-backed or server database.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# SQLite connection tuning: WAL lets readers run alongside the single writer,
+# NORMAL sync is durable under WAL except on power loss, and busy_timeout
+# makes writers wait for the lock instead of failing immediately.
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("busy_timeout", SQLITE_BUSY_TIMEOUT_MS),
+    ("mmap_size", SQLITE_MMAP_SIZE),
 )
+
+# Async drivers for the sync URLs above: aiosqlite locally, asyncpg on Postgres.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+def engine_options(url: str) -> dict:
+    """Keyword arguments for create_engine/create_async_engine for ``url``."""
+    parsed = make_url(url)
+    options = {}
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection; pool sizing
+            # does not apply.
+            return options
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    return options
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def _configure(engine, label: str = "sync"):
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    instrument(engine)
+    instrument_pool(engine, label)
+    return engine
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL, **kwargs):
+    """Create the sync engine for ``url`` with the configured pool and pragmas."""
+    return _configure(create_engine(url, **{**engine_options(url), **kwargs}))
+
+def create_async_db_engine(url: str = SQLALCHEMY_DATABASE_URL, **kwargs):
+    """Async counterpart of :func:`create_db_engine`."""
+    options = engine_options(url)
+    if "pool_size" in options:
+        # Async drivers need the asyncio-aware queue. Without an explicit
+        # class aiosqlite would also default to NullPool, which reopens the
+        # file and reruns the pragmas on every checkout.
+        options["poolclass"] = TimedAsyncAdaptedQueuePool
+    engine = create_async_engine(to_async_url(url), **{**options, **kwargs})
+    _configure(engine.sync_engine, "async")
+    return engine
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine()
+# expire_on_commit=False: attributes cannot be lazily reloaded on an
+# AsyncSession, so objects must stay readable after commit.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
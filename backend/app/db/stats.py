@@ -0,0 +1,129 @@
+"""Maintenance of the ``user_daily_stats`` rollup.
+
+Every task write records the change it makes to its due day's bucket
+inside the same transaction, so the dashboard reads one row per day
+instead of scanning ``tasks``. ``rebuild_daily_stats`` recomputes the
+rollup from scratch and is exposed as ``python -m backend.app.db.stats``.
+"""
+import argparse
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from ..models.stats import UserDailyStats
+from ..models.task import Task
+
+TaskSnapshot = Tuple[date, bool, int]
+
+stats_table = UserDailyStats.__table__
+
+def snapshot_task(task) -> Optional[TaskSnapshot]:
+    """Capture the fields of ``task`` that feed the rollup."""
+    if task is None or task.due_date is None:
+        return None
+    return task.due_date.date(), bool(task.is_completed), task.points or 0
+
+def _upsert(db: Session, user_id: int, day: date, total: int, completed: int, points: int) -> None:
+    dialect = db.get_bind().dialect.name
+    values = dict(user_id=user_id, day=day, total=total, completed=completed, points=points)
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(stats_table).values(**values)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[stats_table.c.user_id, stats_table.c.day],
+            set_={
+                "total": stats_table.c.total + stmt.excluded.total,
+                "completed": stats_table.c.completed + stmt.excluded.completed,
+                "points": stats_table.c.points + stmt.excluded.points,
+            },
+        ))
+        return
+
+    result = db.execute(
+        update(stats_table)
+        .where(stats_table.c.user_id == user_id, stats_table.c.day == day)
+        .values(
+            total=stats_table.c.total + total,
+            completed=stats_table.c.completed + completed,
+            points=stats_table.c.points + points,
+        )
+    )
+    if result.rowcount == 0:
+        db.execute(stats_table.insert().values(**values))
+
+def record_task_change(
+    db: Session,
+    user_id: int,
+    before: Optional[TaskSnapshot],
+    after: Optional[TaskSnapshot],
+) -> None:
+    """Apply the rollup delta of a task going from ``before`` to ``after``.
+
+    Either side may be ``None`` for creation and deletion. The caller
+    commits, so the rollup changes with the task or not at all.
+    """
+    record_task_changes(db, user_id, [(before, after)])
+
+def record_task_changes(
+    db: Session,
+    user_id: int,
+    changes: Iterable[Tuple[Optional[TaskSnapshot], Optional[TaskSnapshot]]],
+) -> None:
+    """Apply many ``(before, after)`` changes with one upsert per touched day."""
+    deltas: Dict[date, list] = defaultdict(lambda: [0, 0, 0])
+    for before, after in changes:
+        for snapshot, sign in ((before, -1), (after, 1)):
+            if snapshot is None:
+                continue
+            day, is_completed, points = snapshot
+            deltas[day][0] += sign
+            if is_completed:
+                deltas[day][1] += sign
+                deltas[day][2] += sign * points
+
+    for day, (total, completed, points) in sorted(deltas.items()):
+        if total or completed or points:
+            _upsert(db, user_id, day, total, completed, points)
+
+def rebuild_daily_stats(db: Session, user_id: Optional[int] = None) -> None:
+    """Recompute the rollup from ``tasks`` for one user or everyone."""
+    clear = delete(stats_table)
+    source = select(
+        Task.user_id,
+        func.date(Task.due_date),
+        func.count(Task.id),
+        func.sum(case((Task.is_completed == True, 1), else_=0)),
+        func.sum(case((Task.is_completed == True, Task.points), else_=0)),
+    ).where(Task.user_id.isnot(None), Task.due_date.isnot(None))
+    if user_id is not None:
+        clear = clear.where(stats_table.c.user_id == user_id)
+        source = source.where(Task.user_id == user_id)
+    source = source.group_by(Task.user_id, func.date(Task.due_date))
+
+    db.execute(clear)
+    db.execute(stats_table.insert().from_select(
+        ["user_id", "day", "total", "completed", "points"], source
+    ))
+
+def main() -> None:
+    from .session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild the user_daily_stats rollup.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuild_daily_stats(db, args.user_id)
+        db.commit()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
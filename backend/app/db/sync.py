@@ -0,0 +1,162 @@
+"""Delta sync of a user's tasks and goals.
+
+The database sets ``updated_at`` on every insert and UPDATE of a task or
+goal, and deleting one leaves a ``tombstones`` row. A sync reads what
+changed at or after ``since`` through the ``(user_id, updated_at)`` and
+``(user_id, deleted_at)`` indexes, so its cost follows the size of the
+change rather than of the user's history.
+
+These timestamps come from the database clock, which has one-second
+resolution on SQLite and on PostgreSQL is the start of the writing
+transaction, so a write committed just after a sync can carry an
+earlier ``updated_at``. Each sync therefore re-reads the
+``SYNC_OVERLAP_SECONDS`` before ``since``; rows are applied by id, so
+repeats are harmless. Tombstones are pruned after
+``SYNC_TOMBSTONE_RETENTION_DAYS``, and a client that last synced before
+that gets a full snapshot instead.
+
+A snapshot is served in pages of at most ``limit`` rows, each table in
+``(updated_at, id)`` order through the same indexes. Its token is the
+time the first page was read: a row updated while the client pages only
+moves further along, so it is never skipped, and the next delta sync
+reports whatever changed or was deleted in the meantime.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+import os
+
+from sqlalchemy import DateTime, delete, func, literal, or_, select
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+
+from ..models import Goal, Task, Tombstone, User
+
+SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "5"))
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+SYNCED_MODELS = {"tasks": Task, "goals": Goal}
+
+# SQLite's CURRENT_TIMESTAMP is stored as text without fractional seconds,
+# while datetimes are bound with them, so '... 12:00:00' compared to
+# '... 12:00:00.000000' would miss rows stamped in the very same second.
+DATABASE_CLOCK = DateTime().with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite")
+
+def clock(moment: datetime):
+    """``moment`` as a bound value comparable with database timestamps."""
+    return literal(moment, DATABASE_CLOCK)
+
+def record_deletion(user_id: int, model, entity_id: int) -> Tombstone:
+    """Tombstone for a deleted row; add it in the deleting transaction."""
+    return Tombstone(user_id=user_id, entity=model.__tablename__, entity_id=entity_id)
+
+def database_now(db: Session) -> datetime:
+    """The database clock as naive UTC, like the columns it is compared with.
+
+    PostgreSQL's now() is a timestamptz; SQLite's is already naive.
+    """
+    now = db.execute(select(func.now())).scalar_one()
+    if now.tzinfo is not None:
+        now = now.astimezone(timezone.utc).replace(tzinfo=None)
+    return now
+
+def retention_horizon(now: datetime) -> datetime:
+    return now - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+
+def changes_since(db: Session, user_id: int, since: Optional[datetime], limit: int) -> Dict:
+    """Everything ``user_id`` changed at or after ``since``, or the first
+    page of a snapshot when ``since`` is None or older than the tombstones
+    kept.
+
+    Returns ``now`` (the token for the next sync), ``reset``, ``user``
+    (None if unchanged), a row list per synced table, ``deleted`` ids per
+    table and ``next``, the position of the next snapshot page or None.
+    Rows that were deleted and have since reappeared under the same id are
+    reported as live only.
+    """
+    now = database_now(db)
+    start = since - timedelta(seconds=SYNC_OVERLAP_SECONDS) if since is not None else None
+    if start is None or start < retention_horizon(now):
+        return snapshot_page(db, user_id, now, None, limit)
+    threshold = clock(start)
+    changes = {"now": now, "reset": False, "next": None, "deleted": {}}
+
+    changes["user"] = db.execute(
+        select(*User.__table__.columns).where(User.id == user_id, User.updated_at >= threshold)
+    ).first()
+    for name, model in SYNCED_MODELS.items():
+        query = (
+            select(*model.__table__.columns)
+            .where(model.user_id == user_id, model.updated_at >= threshold)
+            .order_by(model.updated_at, model.id)
+        )
+        changes[name] = db.execute(query).all()
+        changes["deleted"][name] = []
+
+    tables = {model.__tablename__: name for name, model in SYNCED_MODELS.items()}
+    live = {name: {row.id for row in changes[name]} for name in SYNCED_MODELS}
+    tombstones = db.execute(
+        select(Tombstone.entity, Tombstone.entity_id)
+        .where(Tombstone.user_id == user_id, Tombstone.deleted_at >= threshold)
+        .distinct()
+    )
+    for entity, entity_id in tombstones:
+        name = tables.get(entity)
+        if name is not None and entity_id not in live[name]:
+            changes["deleted"][name].append(entity_id)
+    return changes
+
+SnapshotPosition = Tuple[str, Optional[datetime], int]
+
+def snapshot_query(model, user_id: int, updated_at: Optional[datetime], row_id: int, limit: int):
+    """Up to ``limit`` of the user's rows after ``(updated_at, row_id)``."""
+    query = select(*model.__table__.columns).where(model.user_id == user_id)
+    if updated_at is not None:
+        # The bare >= gives the index scan its starting point.
+        query = query.where(
+            model.updated_at >= clock(updated_at),
+            or_(model.updated_at > clock(updated_at), model.id > row_id),
+        )
+    return query.order_by(model.updated_at, model.id).limit(limit)
+
+def snapshot_page(
+    db: Session,
+    user_id: int,
+    started_at: datetime,
+    after: Optional[SnapshotPosition],
+    limit: int,
+) -> Dict:
+    """The page of the snapshot begun at ``started_at`` that follows
+    ``after``, a ``(table, updated_at, id)`` position taken from the
+    previous page's ``next``; None starts the snapshot.
+
+    Returns the same keys as ``changes_since``. The user row comes with the
+    first page only.
+    """
+    changes = {"now": started_at, "reset": True, "next": None, "user": None, "deleted": {}}
+    for name in SYNCED_MODELS:
+        changes[name] = []
+        changes["deleted"][name] = []
+    names = list(SYNCED_MODELS)
+    if after is None:
+        changes["user"] = db.execute(select(*User.__table__.columns).where(User.id == user_id)).first()
+        after = (names[0], None, 0)
+
+    table, updated_at, row_id = after
+    for name in names[names.index(table):]:
+        if limit == 0:
+            changes["next"] = (name, updated_at, row_id)
+            break
+        rows = db.execute(snapshot_query(SYNCED_MODELS[name], user_id, updated_at, row_id, limit + 1)).all()
+        changes[name] = rows[:limit]
+        if len(rows) > limit:
+            last = changes[name][-1]
+            changes["next"] = (name, last.updated_at, last.id)
+            break
+        limit -= len(rows)
+        updated_at, row_id = None, 0
+    return changes
+
+def prune_tombstones(db: Session) -> int:
+    """Delete tombstones no delta sync can ask for any more."""
+    horizon = retention_horizon(database_now(db))
+    return db.execute(delete(Tombstone).where(Tombstone.deleted_at < horizon)).rowcount
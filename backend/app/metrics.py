@@ -0,0 +1,156 @@
+"""Prometheus metrics for the API, the connection pools and background work.
+
+Exposed in the text format at ``GET /metrics``. With several uvicorn or
+gunicorn workers, point ``PROMETHEUS_MULTIPROC_DIR`` at an empty
+directory shared by all of them (and the Celery worker, for enqueue
+latency) and clear it on deploy: each process then writes its samples to
+memory-mapped files there and ``/metrics`` aggregates them, whichever
+worker serves the scrape. Gunicorn should also call
+``mark_process_dead(worker.pid)`` from its ``child_exit`` hook so gauges
+of exited workers are dropped.
+"""
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.routing import Match
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STREAM_BUCKETS = (1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Time to handle a request, by route template.",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+# Event streams and exports stay open for minutes, which would swamp the
+# request latency percentiles, so streamed responses are timed here
+# instead.
+STREAM_SECONDS = Histogram(
+    "http_stream_duration_seconds", "Time to send a streamed response, by route template.",
+    ["method", "route"], buckets=STREAM_BUCKETS,
+)
+REQUESTS = Counter(
+    "http_requests", "Requests handled, by route template and status code.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests being handled.", multiprocess_mode="livesum",
+)
+DB_CONNECTIONS_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Connections currently checked out of the pool.",
+    ["engine"], multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled connection.",
+    ["engine"], buckets=LATENCY_BUCKETS,
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "bcrypt hash/verify calls running or waiting.",
+    multiprocess_mode="livesum",
+)
+CELERY_ENQUEUE_SECONDS = Histogram(
+    "celery_enqueue_seconds", "Time to publish a Celery task to the broker.",
+    ["task"], buckets=LATENCY_BUCKETS,
+)
+
+class _TimedCheckout:
+    """Pool mixin recording how long each checkout takes, waiting for a
+    free connection and pre-ping included."""
+    engine_label = ""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(self.engine_label).observe(time.perf_counter() - started)
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    engine_label = "sync"
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+def instrument_pool(engine, label: str) -> None:
+    """Track connections checked out of ``engine``'s pool."""
+    checked_out = DB_CONNECTIONS_CHECKED_OUT.labels(label)
+    event.listen(engine, "checkout", lambda *args: checked_out.inc())
+    event.listen(engine, "checkin", lambda *args: checked_out.dec())
+
+def route_template(scope) -> str:
+    """Path template of the route ``scope`` matches, keeping label cardinality
+    bounded by the number of routes rather than of distinct URLs."""
+    partial = UNMATCHED_ROUTE
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial == UNMATCHED_ROUTE:
+            # Path matches but the method does not (405), unless a later
+            # route matches both.
+            partial = route.path
+    return partial
+
+class MetricsMiddleware:
+    """Plain ASGI middleware recording latency, status and concurrency."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        streamed = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, streamed
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Only streamed bodies go out without a Content-Length; the
+                # chunking itself says nothing, as @app.middleware re-chunks
+                # every response.
+                streamed = status_code not in (204, 304) and all(
+                    name.lower() != b"content-length" for name, _ in message.get("headers", ())
+                )
+            await send(message)
+
+        route = route_template(scope)
+        started = time.perf_counter()
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            histogram = STREAM_SECONDS if streamed else REQUEST_SECONDS
+            histogram.labels(scope["method"], route).observe(time.perf_counter() - started)
+            REQUESTS.labels(scope["method"], route, str(status_code)).inc()
+
+def render_metrics() -> bytes:
+    """Current samples in the Prometheus text format, from every worker in
+    multiprocess mode."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+def mark_process_dead(pid: int) -> None:
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
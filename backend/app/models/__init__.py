@@ -1,3 +1,8 @@
 from .user import User
 from .task import Task
 from .goal import Goal
+from .journal import Journal
+from .stats import UserDailyStats
+from .points import PointsLedger
+from .tombstone import Tombstone
+from .reminder import ReminderOutbox, ScheduledReminder
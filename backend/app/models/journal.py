@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Index
+from datetime import datetime
+from ..db.base_class import Base
+
+class Journal(Base):
+    __tablename__ = "journals"
+    __table_args__ = (
+        Index("ix_journals_user_id_date", "user_id", "date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    content = Column(Text)
+    date = Column(DateTime, default=datetime.utcnow)
+    user_id = Column(Integer, ForeignKey("users.id"))
\ No newline at end of file
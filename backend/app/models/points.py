@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from ..db.base_class import Base
+
+class PointsLedger(Base):
+    """Append-only record of every change to a user's points balance."""
+    __tablename__ = "points_ledger"
+    __table_args__ = (
+        Index("ix_points_ledger_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # No foreign key: entries outlive the task they were earned with. Not
+    # unique either: SQLite hands a deleted task's id to the next new task.
+    # The conditional UPDATE in db.points is what credits a task only once.
+    task_id = Column(Integer, nullable=True)
+    delta = Column(Integer, nullable=False)
+    reason = Column(String, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
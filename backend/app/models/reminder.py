@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+from ..db.base_class import Base
+
+class ReminderOutbox(Base):
+    """Reminder changes written with the task and drained by a background dispatcher."""
+    __tablename__ = "reminder_outbox"
+    __table_args__ = (
+        Index("ix_reminder_outbox_task_id", "task_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # No foreign key: a cancel entry must outlive the deleted task.
+    task_id = Column(Integer, nullable=False)
+    user_email = Column(String, nullable=False)
+    action = Column(String, nullable=False)
+    remind_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+class ScheduledReminder(Base):
+    """The one pending reminder per task, swept by time instead of held as a Celery ETA."""
+    __tablename__ = "scheduled_reminders"
+
+    task_id = Column(Integer, primary_key=True)
+    user_email = Column(String, nullable=False)
+    remind_at = Column(DateTime, nullable=False, index=True)
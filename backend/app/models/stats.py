@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from ..db.base_class import Base
+
+class UserDailyStats(Base):
+    """Per-user, per-day rollup of tasks keyed by their due date."""
+    __tablename__ = "user_daily_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
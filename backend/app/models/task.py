@@ -1,9 +1,16 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.sql import func
 from ..db.base_class import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_user_id_due_date", "user_id", "due_date"),
+        Index("ix_tasks_user_id_is_completed", "user_id", "is_completed"),
+        Index("ix_tasks_user_id_start_time", "user_id", "start_time"),
+        Index("ix_tasks_user_id_end_time", "user_id", "end_time"),
+        Index("ix_tasks_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -14,6 +21,7 @@ class Task(Base):
     end_time = Column(DateTime, nullable=False)
     is_completed = Column(Boolean, default=False)
     completed_at = Column(DateTime, nullable=True)
-    goal_id = Column(Integer, ForeignKey("goals.id"), nullable=True)
+    goal_id = Column(Integer, ForeignKey("goals.id"), nullable=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now()) 
\ No newline at end of file
@@ -1,3 +1,6 @@
 from .user import UserCreate, UserResponse
-from .task import TaskCreate, TaskUpdate, TaskResponse
+from .task import TaskCreate, TaskUpdate, TaskResponse, TaskBatchRequest, TaskBatchResponse, TaskRangeResponse
 from .goal import Goal, GoalCreate, GoalUpdate, GoalResponse, GoalType
+from .journal import JournalResponse
+from .search import SearchHit
+from .sync import SyncResponse
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class JournalResponse(BaseModel):
+    id: int
+    content: str
+    # Rows from before the column had a default have no date.
+    date: Optional[datetime] = None
+    user_id: int
+
+    class Config:
+        orm_mode = True
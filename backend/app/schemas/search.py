@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+MAX_SEARCH_RESULTS = 50
+MAX_SEARCH_OFFSET = 1000
+
+class SearchHit(BaseModel):
+    """One ranked match; ``title`` and ``snippet`` are HTML-escaped user
+    text with matched words wrapped in ``<mark>`` tags."""
+    kind: Literal["task", "journal"]
+    id: int
+    title: Optional[str] = None
+    snippet: str
+    rank: float
\ No newline at end of file
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from .goal import GoalResponse
+from .task import TaskResponse
+from .user import UserResponse
+
+class SyncDeletions(BaseModel):
+    tasks: List[int] = []
+    goals: List[int] = []
+
+class SyncResponse(BaseModel):
+    """Rows changed since the ``since`` token; pass ``token`` as the next
+    ``since``. With ``reset`` the rows are a page of a full snapshot that,
+    once ``more`` is false, replaces the client's copy; until then pass
+    ``cursor`` to fetch the next page, and ``token`` is unset."""
+    token: Optional[str] = None
+    cursor: Optional[str] = None
+    more: bool = False
+    reset: bool
+    user: Optional[UserResponse] = None
+    tasks: List[TaskResponse] = []
+    goals: List[GoalResponse] = []
+    deleted: SyncDeletions = SyncDeletions()
\ No newline at end of file
@@ -1,6 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional, Union
+from typing_extensions import Annotated
+
+MAX_BATCH_OPERATIONS = 5000
+MAX_RANGE_DAYS = 366
 
 class TaskBase(BaseModel):
     title: str
@@ -28,4 +32,49 @@ class TaskResponse(TaskBase):
     updated_at: datetime
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+class TaskBatchCreate(BaseModel):
+    op: Literal["create"]
+    task: TaskCreate
+
+class TaskBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    task: TaskUpdate
+
+class TaskBatchComplete(BaseModel):
+    op: Literal["complete"]
+    id: int
+
+TaskBatchOperation = Annotated[
+    Union[TaskBatchCreate, TaskBatchUpdate, TaskBatchComplete],
+    Field(discriminator="op"),
+]
+
+class TaskBatchRequest(BaseModel):
+    operations: List[TaskBatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+class TaskBatchResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[int] = None
+    status: int
+    detail: Optional[str] = None
+
+class TaskBatchResponse(BaseModel):
+    results: List[TaskBatchResult]
+    points_awarded: int = 0
+
+class TaskRangeResponse(BaseModel):
+    """Tasks overlapping ``[start, end)`` as one list per column, in
+    ``start_time`` order; the nth entry of each list is the nth task."""
+    start: datetime
+    end: datetime
+    id: List[int] = []
+    title: List[str] = []
+    start_time: List[datetime] = []
+    end_time: List[datetime] = []
+    is_completed: List[bool] = []
+    points: List[int] = []
+    goal_id: List[Optional[int]] = []
\ No newline at end of file
@@ -1,11 +1,19 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
+import threading
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from backend.app.db.session import get_db
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from backend.app.db.session import get_async_db
+from backend.app.metrics import PASSWORD_HASH_QUEUE_DEPTH
 from backend.app.models import User
 import backend.app.schemas as schemas
 import os
@@ -18,19 +26,130 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+# bcrypt costs ~100-300 ms of CPU per call, so async endpoints hand it to a
+# small dedicated pool instead of running it on the event loop.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+class PrincipalCache:
+    """Bounded TTL/LRU cache of user rows keyed by token subject.
+
+    Entries are plain column snapshots rather than ORM instances so they can
+    be shared across sessions and threads. Any ORM update or delete of a user
+    in this process drops its entry; other workers pick up changes once the
+    TTL expires.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, subject: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[subject]
+                return None
+            self._entries.move_to_end(subject)
+            return snapshot
+
+    def put(self, subject: str, user: User) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        snapshot = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str) -> None:
+        with self._lock:
+            self._entries.pop(subject, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+principal_cache = PrincipalCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+
+def invalidate_cached_user(email: str) -> None:
+    """Drop a cached principal, e.g. after a Core UPDATE that bypasses the ORM."""
+    principal_cache.invalidate(email)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_principal(mapper, connection, target):
+    principal_cache.invalidate(target.email)
+    # A changed email must also evict the entry under the old subject.
+    for old_email in inspect(target).attrs.email.history.deleted:
+        principal_cache.invalidate(old_email)
+
+async def _attach_cached_user(db: AsyncSession, snapshot: dict) -> User:
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+_password_executor = (
+    ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+    if PASSWORD_HASH_WORKERS > 0 else None
+)
+_password_jobs = 0
+_password_jobs_lock = threading.Lock()
+
+def password_hash_queue_depth() -> int:
+    """Number of hash/verify calls running or waiting in the pool."""
+    return _password_jobs
+
+async def _run_password_job(func, *args):
+    global _password_jobs
+    if _password_executor is None:
+        return func(*args)
+    with _password_jobs_lock:
+        if _password_jobs >= PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent sign-in attempts, please retry",
+                headers={"Retry-After": "1"},
+            )
+        _password_jobs += 1
+    PASSWORD_HASH_QUEUE_DEPTH.inc()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        with _password_jobs_lock:
+            _password_jobs -= 1
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password, hashed_password):
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await _run_password_job(get_password_hash, password)
+
 def get_user(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
+async def get_user_async(db: AsyncSession, email: str):
+    return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
 def authenticate_user(db: Session, email: str, password: str):
     user = get_user(db, email)
     if not user:
@@ -39,6 +158,14 @@ def authenticate_user(db: Session, email: str, password: str):
         return False
     return user
 
+async def authenticate_user_async(db: AsyncSession, email: str, password: str):
+    user = await get_user_async(db, email)
+    if not user:
+        return False
+    if not await verify_password_async(password, user.hashed_password):
+        return False
+    return user
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -49,7 +176,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -63,9 +190,13 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    user = get_user(db, email=token_data.email)
+    snapshot = principal_cache.get(token_data.email)
+    if snapshot is not None:
+        return await _attach_cached_user(db, snapshot)
+    user = await get_user_async(db, email=token_data.email)
     if user is None:
         raise credentials_exception
+    principal_cache.put(token_data.email, user)
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
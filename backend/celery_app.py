@@ -1,28 +1,185 @@
 from celery import Celery
+from celery.signals import after_task_publish, before_task_publish, worker_process_shutdown
+from collections import defaultdict
 from datetime import datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
+import logging
 import os
+import smtplib
+import time
 from dotenv import load_dotenv
+from backend.app.db.outbox import apply_outbox, claim_due_reminders
+from backend.app.db.session import SessionLocal
+from backend.app.db.sync import prune_tombstones
+from backend.app.metrics import CELERY_ENQUEUE_SECONDS, mark_process_dead
+from backend.app.models import Task
+from backend.notifications import TRANSIENT_ERRORS, send_notification, set_transport
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "500"))
+# Reminders due within this window are fired by the current sweep, so the
+# sweep interval should not be longer than the window.
+REMINDER_SWEEP_WINDOW_SECONDS = float(os.getenv("REMINDER_SWEEP_WINDOW_SECONDS", "60"))
+REMINDER_RETRY_DELAY_SECONDS = int(os.getenv("REMINDER_RETRY_DELAY_SECONDS", "30"))
+
 celery_app = Celery(
     "productivity_plus",
     broker=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
     backend=os.getenv("REDIS_URL", "redis://localhost:6379/0")
 )
 
+celery_app.conf.beat_schedule = {
+    "sweep-reminders": {
+        "task": "backend.celery_app.sweep_reminders",
+        "schedule": REMINDER_SWEEP_WINDOW_SECONDS,
+    },
+    "prune-sync-tombstones": {
+        "task": "backend.celery_app.prune_sync_tombstones",
+        "schedule": 24 * 60 * 60,
+    },
+}
+
+# Publish start times by task id, between the two publish signals.
+_publish_started: Dict[str, float] = {}
+
+@before_task_publish.connect
+def _start_publish_timer(sender=None, headers=None, **kwargs):
+    _publish_started[headers["id"]] = time.perf_counter()
+
+@after_task_publish.connect
+def _observe_publish(sender=None, headers=None, **kwargs):
+    started = _publish_started.pop(headers["id"], None)
+    if started is not None:
+        CELERY_ENQUEUE_SECONDS.labels(sender).observe(time.perf_counter() - started)
+
+def format_digest(tasks) -> Tuple[str, str]:
+    if len(tasks) == 1:
+        subject = f"Reminder: {tasks[0].title} starts soon"
+    else:
+        subject = f"Reminder: {len(tasks)} tasks start soon"
+    lines = [f"- {task.start_time:%H:%M} {task.title}" for task in sorted(tasks, key=lambda t: t.start_time)]
+    return subject, "Starting in about 15 minutes:\n" + "\n".join(lines)
+
+def deliver_reminders(reminders: Sequence[Sequence], raise_errors: bool = False) -> Dict[str, List[int]]:
+    """Send one digest per user for ``(task_id, user_email)`` pairs.
+
+    Deleted and completed tasks are skipped. Returns the task ids whose
+    digest failed with a transient or unexpected error, keyed by user,
+    unless ``raise_errors`` is set; one user's failure never stops the
+    others' digests, whose reminders are already claimed. Digests the
+    server rejects permanently are logged and dropped, since a retry would
+    be rejected the same way.
+    """
+    task_ids = [task_id for task_id, _ in reminders]
+    db = SessionLocal()
+    try:
+        pending = {
+            task.id: task for task in db.query(Task.id, Task.title, Task.start_time).filter(
+                Task.id.in_(task_ids), Task.is_completed.isnot(True)
+            )
+        }
+    finally:
+        db.close()
+
+    digests = defaultdict(list)
+    for task_id, user_email in reminders:
+        if task_id in pending:
+            digests[user_email].append(pending[task_id])
+
+    failed = {}
+    for user_email, tasks in digests.items():
+        subject, body = format_digest(tasks)
+        try:
+            send_notification(user_email, subject, body)
+        except TRANSIENT_ERRORS:
+            if raise_errors:
+                raise
+            failed[user_email] = [task.id for task in tasks]
+        except smtplib.SMTPException:
+            if raise_errors:
+                raise
+            logger.exception("Reminder digest to %s was rejected", user_email)
+        except Exception:
+            if raise_errors:
+                raise
+            logger.exception("Reminder digest to %s failed", user_email)
+            failed[user_email] = [task.id for task in tasks]
+    return failed
+
 @celery_app.task
 def send_task_reminder(task_id: int, user_email: str):
-    # This is a placeholder for the actual notification logic
-    # In a real application, you would implement email/SMS/push notifications here
-    print(f"Sending reminder for task {task_id} to user {user_email}")
-
-def schedule_task_reminder(task_id: int, user_email: str, start_time: datetime):
-    # Schedule reminder 15 minutes before task start time
-    reminder_time = start_time - timedelta(minutes=15)
-    if reminder_time > datetime.utcnow():
-        celery_app.send_task(
-            'celery_app.send_task_reminder',
-            args=[task_id, user_email],
-            eta=reminder_time
-        ) 
\ No newline at end of file
+    deliver_reminders([(task_id, user_email)], raise_errors=True)
+
+@celery_app.task
+def send_task_reminders(reminders: List[List]):
+    """Deliver a swept batch; users whose digest failed are retried on their own."""
+    for user_email, task_ids in deliver_reminders(reminders).items():
+        send_reminder_digest.apply_async(args=[user_email, task_ids], countdown=REMINDER_RETRY_DELAY_SECONDS)
+
+@celery_app.task(
+    autoretry_for=TRANSIENT_ERRORS,
+    retry_backoff=REMINDER_RETRY_DELAY_SECONDS,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=5,
+)
+def send_reminder_digest(user_email: str, task_ids: List[int]):
+    deliver_reminders([(task_id, user_email) for task_id in task_ids], raise_errors=True)
+
+@worker_process_shutdown.connect
+def close_notification_transport(**kwargs):
+    set_transport(None)
+
+@worker_process_shutdown.connect
+def drop_process_metrics(pid=None, **kwargs):
+    mark_process_dead(pid or os.getpid())
+
+@celery_app.task
+def dispatch_reminder_outbox(batch_size: int = REMINDER_BATCH_SIZE):
+    """Fold the reminder outbox into the scheduled_reminders table."""
+    db = SessionLocal()
+    try:
+        while True:
+            consumed = apply_outbox(db, batch_size)
+            db.commit()
+            if consumed < batch_size:
+                return
+    finally:
+        db.close()
+
+@celery_app.task
+def sweep_reminders(batch_size: int = REMINDER_BATCH_SIZE):
+    """Fire every reminder due within the next sweep window.
+
+    Runs from beat. Pending outbox entries are applied first so a task
+    rescheduled or deleted moments ago is not reminded at its old time.
+    Due reminders go out as one bulk message per batch rather than one
+    long-lived ETA message per task, and are delivered as one digest per
+    user.
+    """
+    dispatch_reminder_outbox(batch_size)
+    horizon = datetime.utcnow() + timedelta(seconds=REMINDER_SWEEP_WINDOW_SECONDS)
+    db = SessionLocal()
+    try:
+        while True:
+            due = claim_due_reminders(db, horizon, batch_size)
+            if due:
+                send_task_reminders.delay([[row.task_id, row.user_email] for row in due])
+            db.commit()
+            if len(due) < batch_size:
+                return
+    finally:
+        db.close()
+
+@celery_app.task
+def prune_sync_tombstones():
+    """Drop tombstones older than the delta sync retention window."""
+    db = SessionLocal()
+    try:
+        prune_tombstones(db)
+        db.commit()
+    finally:
+        db.close()
\ No newline at end of file
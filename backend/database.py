@@ -1,27 +1,11 @@
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./productivity_plus.db")
-
-# For SQLite, we need to add check_same_thread=False
-connect_args = {"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args=connect_args
+from backend.app.db.session import (
+    SQLALCHEMY_DATABASE_URL,
+    SessionLocal,
+    engine,
+    get_db,
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base = declarative_base()
 
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+# The engine, session factory and get_db dependency are shared with the app
+# package so both routers use one connection pool.
+Base = declarative_base()
\ No newline at end of file
@@ -1,12 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 from datetime import datetime
 import uvicorn
 import os
-from backend.app.api.endpoints import tasks, goals, auth
+from backend.app.api.endpoints import tasks, goals, auth, search, events, sync, export
 from backend.app.db.init_db import init_db
+from backend.app.db.instrumentation import track_queries
+from backend.app.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, render_metrics
 
 app = FastAPI(title="Productivity Plus", version="1.0.0")
 
@@ -23,18 +25,37 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+@app.middleware("http")
+async def add_server_timing(request: Request, call_next):
+    with track_queries() as stats:
+        response = await call_next(request)
+    response.headers["Server-Timing"] = stats.server_timing()
+    return response
+
+# Added last so it wraps the other middleware and times whole requests.
+app.add_middleware(MetricsMiddleware)
+
 # Mount static files
 static_dir = os.path.join(os.path.dirname(__file__), "static")
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+if os.path.isdir(static_dir):
+    app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 # Include routers
 app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
 app.include_router(goals.router, prefix="/api/goals", tags=["goals"])
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+app.include_router(search.router, prefix="/api/search", tags=["search"])
+app.include_router(events.router, prefix="/api/events", tags=["events"])
+app.include_router(sync.router, prefix="/api/sync", tags=["sync"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to Productivity Plus API"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(render_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
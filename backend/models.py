@@ -1,5 +1,6 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Enum
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Date, DateTime, Text, Enum
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
 import enum
 from datetime import datetime
@@ -19,6 +20,8 @@ class User(Base):
     hashed_password = Column(String)
     is_active = Column(Boolean, default=True)
     points = Column(Integer, default=0)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     tasks = relationship("Task", back_populates="owner")
     goals = relationship("Goal", back_populates="owner")
@@ -26,24 +29,37 @@ class User(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_user_id_due_date", "user_id", "due_date"),
+        Index("ix_tasks_user_id_is_completed", "user_id", "is_completed"),
+        Index("ix_tasks_user_id_start_time", "user_id", "start_time"),
+        Index("ix_tasks_user_id_end_time", "user_id", "end_time"),
+        Index("ix_tasks_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     description = Column(Text)
     points = Column(Integer, default=0)
     is_completed = Column(Boolean, default=False)
+    completed_at = Column(DateTime)
     due_date = Column(DateTime)
     start_time = Column(DateTime)
     end_time = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     user_id = Column(Integer, ForeignKey("users.id"))
-    goal_id = Column(Integer, ForeignKey("goals.id"))
+    goal_id = Column(Integer, ForeignKey("goals.id"), index=True)
 
     owner = relationship("User", back_populates="tasks")
     goal = relationship("Goal", back_populates="tasks")
 
 class Goal(Base):
     __tablename__ = "goals"
+    __table_args__ = (
+        Index("ix_goals_user_id_target_date", "user_id", "target_date"),
+        Index("ix_goals_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -51,6 +67,7 @@ class Goal(Base):
     goal_type = Column(Enum(GoalType))
     target_date = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     user_id = Column(Integer, ForeignKey("users.id"))
 
     owner = relationship("User", back_populates="goals")
@@ -58,10 +75,67 @@ class Goal(Base):
 
 class Journal(Base):
     __tablename__ = "journals"
+    __table_args__ = (
+        Index("ix_journals_user_id_date", "user_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text)
     date = Column(DateTime, default=datetime.utcnow)
     user_id = Column(Integer, ForeignKey("users.id"))
 
-    owner = relationship("User", back_populates="journals") 
\ No newline at end of file
+    owner = relationship("User", back_populates="journals")
+
+class UserDailyStats(Base):
+    __tablename__ = "user_daily_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    points = Column(Integer, nullable=False, default=0)
+
+class ReminderOutbox(Base):
+    __tablename__ = "reminder_outbox"
+    __table_args__ = (
+        Index("ix_reminder_outbox_task_id", "task_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, nullable=False)
+    user_email = Column(String, nullable=False)
+    action = Column(String, nullable=False)
+    remind_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+class ScheduledReminder(Base):
+    __tablename__ = "scheduled_reminders"
+
+    task_id = Column(Integer, primary_key=True)
+    user_email = Column(String, nullable=False)
+    remind_at = Column(DateTime, nullable=False, index=True)
+
+class PointsLedger(Base):
+    __tablename__ = "points_ledger"
+    __table_args__ = (
+        Index("ix_points_ledger_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    task_id = Column(Integer)
+    delta = Column(Integer, nullable=False)
+    reason = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entity = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, server_default=func.now())
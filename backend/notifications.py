@@ -0,0 +1,201 @@
+from email.message import EmailMessage
+from importlib import import_module
+from typing import Optional
+import smtplib
+import threading
+import time
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Configuration
+NOTIFICATION_TRANSPORT = os.getenv("NOTIFICATION_TRANSPORT", "console")
+NOTIFICATION_FROM = os.getenv("NOTIFICATION_FROM", "reminders@productivity-plus.local")
+NOTIFICATION_RATE_PER_SECOND = float(os.getenv("NOTIFICATION_RATE_PER_SECOND", "10"))
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() in ("1", "true", "yes")
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))
+
+class TransientDeliveryError(Exception):
+    """Delivery failed in a way a later attempt may not, such as a dropped
+    connection or a 4xx reply."""
+
+# Errors worth retrying with backoff: the transport reconnects on the next try.
+TRANSIENT_ERRORS = (TransientDeliveryError,)
+
+def is_transient(exc: Exception) -> bool:
+    """Whether ``exc`` from a transport is a connection failure or an SMTP
+    4xx reply. 5xx replies, such as an unknown recipient, fail the same way
+    on every retry."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    # Any other SMTPException is a protocol or usage error; plain OSErrors
+    # are refused connections, resets and timeouts.
+    return not isinstance(exc, smtplib.SMTPException) and isinstance(exc, OSError)
+
+class Transport:
+    """Delivers one message to one recipient. Implementations may keep a
+    connection open between calls and must be safe to call from one worker
+    thread at a time."""
+
+    def send(self, recipient: str, subject: str, body: str) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+class ConsoleTransport(Transport):
+    def send(self, recipient: str, subject: str, body: str) -> None:
+        print(f"To: {recipient}\nSubject: {subject}\n\n{body}\n")
+
+class SMTPTransport(Transport):
+    """SMTP delivery over a single persistent connection.
+
+    The connection is opened lazily and reused for every message; if the
+    server dropped it, the next send reconnects once before giving up.
+    Any other failure but a refused recipient, which the server answers
+    cleanly, discards the connection so the next send starts afresh.
+    """
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        username: Optional[str] = SMTP_USERNAME,
+        password: Optional[str] = SMTP_PASSWORD,
+        starttls: bool = SMTP_STARTTLS,
+        timeout: float = SMTP_TIMEOUT,
+        sender: str = NOTIFICATION_FROM,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.sender = sender
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password)
+        return connection
+
+    def send(self, recipient: str, subject: str, body: str) -> None:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(body)
+        with self._lock:
+            try:
+                if self._connection is None:
+                    self._connection = self._connect()
+                try:
+                    self._connection.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    self._discard()
+                    self._connection = self._connect()
+                    self._connection.send_message(message)
+            except smtplib.SMTPRecipientsRefused:
+                raise
+            except Exception:
+                # A timeout or error reply can leave the session mid-command.
+                self._discard()
+                raise
+
+    def _discard(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except OSError:
+                pass
+            self._connection = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.quit()
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._connection = None
+
+class RateLimiter:
+    """Token bucket shared by the threads of one worker process."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+TRANSPORTS = {
+    "console": ConsoleTransport,
+    "smtp": SMTPTransport,
+}
+
+_transport: Optional[Transport] = None
+_transport_lock = threading.Lock()
+rate_limiter = RateLimiter(NOTIFICATION_RATE_PER_SECOND)
+
+def load_transport(name: str = NOTIFICATION_TRANSPORT) -> Transport:
+    """Build a transport from a registered name or a ``module:Class`` path."""
+    if name in TRANSPORTS:
+        return TRANSPORTS[name]()
+    module_name, _, class_name = name.partition(":")
+    return getattr(import_module(module_name), class_name)()
+
+def get_transport() -> Transport:
+    """The process-wide transport, so its connection is reused across tasks."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = load_transport()
+        return _transport
+
+def set_transport(transport: Optional[Transport]) -> None:
+    """Replace the process-wide transport, e.g. to point tests at a local server."""
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+        _transport = transport
+
+def send_notification(recipient: str, subject: str, body: str) -> None:
+    """Send one message; transient failures are raised as
+    :class:`TransientDeliveryError`, anything else as is."""
+    rate_limiter.acquire()
+    try:
+        get_transport().send(recipient, subject, body)
+    except Exception as exc:
+        if is_transient(exc):
+            raise TransientDeliveryError(f"{type(exc).__name__}: {exc}") from exc
+        raise
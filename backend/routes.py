@@ -1,15 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from anyio import from_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
 from datetime import datetime, timedelta
+import json
 import models
 import schemas
 from database import get_db
-from auth import get_current_active_user
-from celery_app import schedule_task_reminder
+from backend.auth import get_current_active_user, invalidate_cached_user
+from backend.app.api.cache import response_cache
+from backend.app.api.events import change_feed
+from backend.app.api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    apply_keyset,
+    split_page,
+)
+from backend.app.api.serialization import ListSerializer
+from backend.app.db.outbox import schedule_reminder
+from backend.app.db.points import complete_tasks
+from backend.app.db.stats import record_task_change, snapshot_task
 
 router = APIRouter()
 
+task_serializer = ListSerializer(models.Task, schemas.Task)
+journal_serializer = ListSerializer(models.Journal, schemas.Journal)
+
 # Task routes
 @router.post("/tasks/", response_model=schemas.Task)
 def create_task(
@@ -19,25 +36,32 @@ def create_task(
 ):
     db_task = models.Task(**task.dict(), user_id=current_user.id)
     db.add(db_task)
+    db.flush()
+    record_task_change(db, current_user.id, None, snapshot_task(db_task))
+    # Queue the reminder in the same transaction; the dispatcher sends it
+    db.add(schedule_reminder(db_task.id, current_user.email, task.start_time))
     db.commit()
+    from_thread.run(response_cache.bump, current_user.id)
     db.refresh(db_task)
-    
-    # Schedule reminder
-    schedule_task_reminder(db_task.id, current_user.email, task.start_time)
-    
+    from_thread.run(change_feed.publish, current_user.id, "task", "created", db_task.id, db_task)
     return db_task
 
 @router.get("/tasks/", response_model=List[schemas.Task])
 def read_tasks(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
-    tasks = db.query(models.Task).filter(
-        models.Task.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    return tasks
+    query = apply_keyset(
+        task_serializer.query(db).filter(models.Task.user_id == current_user.id),
+        models.Task.due_date, models.Task.id, cursor, limit
+    )
+    tasks, next_cursor = split_page(query.all(), limit, "due_date")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return task_serializer.render(tasks, response)
 
 @router.get("/tasks/today", response_model=List[schemas.Task])
 def read_today_tasks(
@@ -45,12 +69,12 @@ def read_today_tasks(
     current_user: models.User = Depends(get_current_active_user)
 ):
     today = datetime.utcnow().date()
-    tasks = db.query(models.Task).filter(
+    tasks = task_serializer.query(db).filter(
         models.Task.user_id == current_user.id,
         models.Task.due_date >= today,
         models.Task.due_date < today + timedelta(days=1)
     ).all()
-    return tasks
+    return task_serializer.render(tasks)
 
 @router.put("/tasks/{task_id}/complete")
 def complete_task(
@@ -65,9 +89,16 @@ def complete_task(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    task.is_completed = True
-    current_user.points += task.points
+    before = snapshot_task(task)
+    completed = complete_tasks(db, current_user.id, [task_id], datetime.utcnow()).get(task_id)
+    if completed is not None and before is not None:
+        record_task_change(db, current_user.id, before, snapshot_task(completed))
     db.commit()
+    if completed is not None and completed.points:
+        invalidate_cached_user(current_user.email)
+    from_thread.run(response_cache.bump, current_user.id)
+    if completed is not None:
+        from_thread.run(change_feed.publish, current_user.id, "task", "completed", task_id, completed)
     return {"message": "Task completed successfully"}
 
 # Goal routes
@@ -80,19 +111,28 @@ def create_goal(
     db_goal = models.Goal(**goal.dict(), user_id=current_user.id)
     db.add(db_goal)
     db.commit()
+    from_thread.run(response_cache.bump, current_user.id)
     db.refresh(db_goal)
+    from_thread.run(change_feed.publish, current_user.id, "goal", "created", db_goal.id, db_goal)
     return db_goal
 
 @router.get("/goals/", response_model=List[schemas.Goal])
 def read_goals(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
-    goals = db.query(models.Goal).filter(
-        models.Goal.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    query = apply_keyset(
+        db.query(models.Goal)
+        .options(selectinload(models.Goal.tasks))
+        .filter(models.Goal.user_id == current_user.id),
+        models.Goal.target_date, models.Goal.id, cursor, limit
+    )
+    goals, next_cursor = split_page(query.all(), limit, "target_date")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return goals
 
 # Journal routes
@@ -105,49 +145,82 @@ def create_journal(
     db_journal = models.Journal(**journal.dict(), user_id=current_user.id)
     db.add(db_journal)
     db.commit()
+    from_thread.run(response_cache.bump, current_user.id)
     db.refresh(db_journal)
+    from_thread.run(change_feed.publish, current_user.id, "journal", "created", db_journal.id, db_journal)
     return db_journal
 
 @router.get("/journals/", response_model=List[schemas.Journal])
 def read_journals(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
-    journals = db.query(models.Journal).filter(
-        models.Journal.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    return journals
+    query = apply_keyset(
+        journal_serializer.query(db).filter(models.Journal.user_id == current_user.id),
+        models.Journal.date, models.Journal.id, cursor, limit
+    )
+    journals, next_cursor = split_page(query.all(), limit, "date")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return journal_serializer.render(journals, response)
 
 # Dashboard routes
 @router.get("/dashboard/stats")
 def get_dashboard_stats(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
     today = datetime.utcnow().date()
+    # The week and month windows move with the date, so it is part of the key.
+    cached = from_thread.run(response_cache.lookup, request, current_user.id, today.isoformat())
+    if cached.response is not None:
+        return cached.response
+
     week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=7)
     month_start = today.replace(day=1)
-    
-    # Weekly stats
-    weekly_tasks = db.query(models.Task).filter(
-        models.Task.user_id == current_user.id,
-        models.Task.due_date >= week_start,
-        models.Task.due_date < week_start + timedelta(days=7)
-    ).all()
-    
-    # Monthly stats
-    monthly_tasks = db.query(models.Task).filter(
-        models.Task.user_id == current_user.id,
-        models.Task.due_date >= month_start,
-        models.Task.due_date < (month_start + timedelta(days=32)).replace(day=1)
-    ).all()
-    
-    return {
-        "total_points": current_user.points,
-        "weekly_completed": sum(1 for task in weekly_tasks if task.is_completed),
-        "weekly_total": len(weekly_tasks),
-        "monthly_completed": sum(1 for task in monthly_tasks if task.is_completed),
-        "monthly_total": len(monthly_tasks)
-    } 
\ No newline at end of file
+    month_end = (month_start + timedelta(days=32)).replace(day=1)
+
+    # Read the per-day rollup for the union of both windows; weekly and
+    # monthly totals are folded from those buckets below.
+    rows = db.query(models.UserDailyStats).filter(
+        models.UserDailyStats.user_id == current_user.id,
+        models.UserDailyStats.day >= min(week_start, month_start),
+        models.UserDailyStats.day < max(week_end, month_end)
+    ).order_by(models.UserDailyStats.day).all()
+
+    # current_user may be a principal cached before another worker's
+    # completion; a stale balance stored here would outlive it.
+    total_points = db.query(models.User.points).filter(models.User.id == current_user.id).scalar()
+    stats = {
+        "total_points": total_points,
+        "weekly_completed": 0,
+        "weekly_total": 0,
+        "weekly_points": 0,
+        "monthly_completed": 0,
+        "monthly_total": 0,
+        "monthly_points": 0,
+        "daily": [],
+    }
+    for row in rows:
+        row_day = row.day
+        bucket = {
+            "date": row_day.isoformat(),
+            "completed": row.completed,
+            "total": row.total,
+            "points": row.points,
+        }
+        stats["daily"].append(bucket)
+        for period, start, end in (
+            ("weekly", week_start, week_end),
+            ("monthly", month_start, month_end),
+        ):
+            if start <= row_day < end:
+                stats[f"{period}_completed"] += bucket["completed"]
+                stats[f"{period}_total"] += bucket["total"]
+                stats[f"{period}_points"] += bucket["points"]
+    return from_thread.run(cached.store, json.dumps(stats).encode())
@@ -52,6 +52,8 @@ class JournalCreate(JournalBase):
 class Journal(JournalBase):
     id: int
     user_id: int
+    # Rows from before the column had a default have no date.
+    date: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -8,10 +8,13 @@ setup(
         "fastapi",
         "uvicorn",
         "sqlalchemy",
+        "aiosqlite",
+        "asyncpg",
         "pydantic",
         "python-jose[cryptography]",
         "passlib[bcrypt]",
         "python-multipart",
         "email-validator",
+        "prometheus-client",
     ],
 ) 
\ No newline at end of file
@@ -0,0 +1,16 @@
+"""End-to-end API benchmark.
+
+Seeds a throwaway SQLite database with synthetic users, tasks, goals and
+journal entries (``data``), then drives the ASGI app in-process through
+httpx with the request scenarios in ``scenarios`` and reports throughput,
+latency percentiles and database queries per request for each, compared
+against a stored baseline:
+
+    python -m benchmarks.api
+    python -m benchmarks.api --scenarios list create --requests 500
+    python -m benchmarks.api --save-baseline
+
+Exits non-zero when a scenario regresses against the baseline, so it can
+gate CI. Latency and throughput depend on the machine, so keep baselines
+per machine (``--baseline``) and compare query counts everywhere.
+"""
@@ -0,0 +1,175 @@
+"""Run the API benchmark; see the package docstring."""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+# Query counts vary by a fraction with cache misses; an N+1 adds at least one.
+QUERY_TOLERANCE = 0.5
+CONFIG_KEYS = ("users", "tasks", "goals", "journals", "requests", "concurrency", "cache")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(client, scenario, users, requests, concurrency, rng):
+    """Send ``requests`` requests with at most ``concurrency`` in flight,
+    each as a random user."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, queries, errors = [], [], 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            before = time.perf_counter()
+            response = await scenario(client, rng.choice(users), rng)
+            latencies.append((time.perf_counter() - before) * 1000)
+        if response.status_code >= 400:
+            errors += 1
+        match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+        if match:
+            queries.append(int(match.group(1)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "queries": round(statistics.mean(queries), 2) if queries else None,
+    }
+
+
+async def run(args):
+    import httpx
+    from backend.main import app
+    from backend.app.db.session import engine
+    from .data import PASSWORD, generate
+    from .scenarios import LEGACY_PREFIX, REQUEST_SHARE, SCENARIOS
+
+    sys.path.insert(0, os.path.join(ROOT, "backend"))
+    import routes
+    app.include_router(routes.router, prefix=LEGACY_PREFIX)
+
+    started = time.perf_counter()
+    users = generate(engine, args.users, args.tasks, args.goals, args.journals, seed=args.seed)
+    print(f"seeded {args.users} users in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(args.seed)
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for user in users:
+            response = await client.post("/api/auth/token", data={"username": user.email, "password": PASSWORD})
+            user.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        for name in args.scenarios:
+            requests = max(1, int(args.requests * REQUEST_SHARE.get(name, 1)))
+            results[name] = await run_scenario(
+                client, SCENARIOS[name], users, requests, args.concurrency, rng
+            )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print results next to the baseline; return the regressed scenarios.
+
+    Half a query per request more than the baseline is a regression
+    regardless of ``tolerance``; latency (p95) and throughput regress when
+    worse than the baseline by more than ``tolerance``.
+    """
+    regressed = []
+    print(f"{'scenario':<10} {'reqs':>5} {'err':>4} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>7}  vs baseline")
+    for name, result in results.items():
+        line = (
+            f"{name:<10} {result['requests']:>5} {result['errors']:>4} {result['rps']:>8.1f} "
+            f"{result['p50_ms']:>7.2f}ms {result['p95_ms']:>7.2f}ms {result['p99_ms']:>7.2f}ms "
+            f"{result['queries'] if result['queries'] is not None else '-':>7}"
+        )
+        base = baseline.get(name)
+        if base is None:
+            print(f"{line}  (no baseline)")
+            continue
+        problems = []
+        if None not in (result["queries"], base.get("queries")) and result["queries"] > base["queries"] + QUERY_TOLERANCE:
+            problems.append(f"queries {base['queries']} -> {result['queries']}")
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            problems.append(f"p95 {base['p95_ms']}ms -> {result['p95_ms']}ms")
+        if result["rps"] < base["rps"] * (1 - tolerance):
+            problems.append(f"rps {base['rps']} -> {result['rps']}")
+        if result["errors"] > base.get("errors", 0):
+            problems.append(f"errors {base.get('errors', 0)} -> {result['errors']}")
+        if problems:
+            regressed.append(name)
+        change = (result["p95_ms"] / base["p95_ms"] - 1) * 100 if base["p95_ms"] else 0.0
+        print(f"{line}  p95 {change:+.0f}%" + (f"  REGRESSED: {', '.join(problems)}" if problems else ""))
+    return regressed
+
+
+def main():
+    from .scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api", description="End-to-end API benchmark.")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks per user")
+    parser.add_argument("--goals", type=int, default=20, help="goals per user")
+    parser.add_argument("--journals", type=int, default=200, help="journal entries per user")
+    parser.add_argument("--requests", type=int, default=400, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--cache", action="store_true", help="keep the response cache enabled")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed p95/rps change, as a fraction")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    if not args.cache:
+        # Measure the handlers, not cache hits on repeated list requests.
+        os.environ["RESPONSE_CACHE_MAX_ENTRIES"] = "0"
+    os.environ.setdefault("PASSWORD_HASH_MAX_PENDING", str(max(args.concurrency, 64)))
+    os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "1000")
+    sys.path.insert(0, ROOT)
+
+    results = asyncio.run(run(args))
+    config = {key: getattr(args, key) for key in CONFIG_KEYS}
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        compare(results, {}, args.tolerance)
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        if stored.get("config") != config:
+            print(f"warning: baseline was recorded with {stored.get('config')}")
+        baseline = stored.get("results", {})
+    regressed = compare(results, baseline, args.tolerance)
+    if regressed:
+        print(f"regressions in: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
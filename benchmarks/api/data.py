@@ -0,0 +1,78 @@
+"""Synthetic accounts for the API benchmark."""
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+PASSWORD = "bench-password"
+HISTORY_DAYS = 365
+
+
+@dataclass
+class BenchUser:
+    id: int
+    email: str
+    open_task_ids: List[int] = field(default_factory=list)
+    completed_task_ids: List[int] = field(default_factory=list)
+    any_task_id: Optional[int] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+def generate(engine, users: int, tasks: int, goals: int, journals: int, seed: int = 42) -> List[BenchUser]:
+    """Insert ``users`` accounts, each with ``tasks`` tasks spread over the
+    past year and the next month, ``goals`` goals and ``journals`` journal
+    entries. All accounts share ``PASSWORD``."""
+    from sqlalchemy import insert, select
+    from sqlalchemy.orm import Session
+    from backend.app.db.stats import rebuild_daily_stats
+    from backend.app.models import Goal, Journal, Task, User
+    from backend.app.schemas.goal import GoalType
+    from backend.auth import get_password_hash
+
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(second=0, microsecond=0)
+    # One bcrypt hash for everybody: hashing per user would dominate setup.
+    hashed = get_password_hash(PASSWORD)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"bench{n}@example.com", "hashed_password": hashed, "is_active": True, "points": 0}
+            for n in range(users)
+        ])
+        accounts = [BenchUser(row.id, row.email) for row in conn.execute(select(User.id, User.email).order_by(User.id))]
+        for account in accounts:
+            if goals:
+                conn.execute(insert(Goal), [{
+                    "title": f"goal {n}", "goal_type": rng.choice(list(GoalType)),
+                    "target_date": now + timedelta(days=rng.randint(7, 365)), "user_id": account.id,
+                } for n in range(goals)])
+            goal_ids = conn.execute(select(Goal.id).where(Goal.user_id == account.id)).scalars().all()
+            rows = []
+            for n in range(tasks):
+                start = now + timedelta(minutes=rng.randrange(-HISTORY_DAYS * 24 * 60, 30 * 24 * 60))
+                rows.append({
+                    "title": f"task {n}", "description": "synthetic benchmark task",
+                    "points": rng.randint(1, 10), "is_completed": start < now and rng.random() < 0.8,
+                    "due_date": start, "start_time": start, "end_time": start + timedelta(minutes=30),
+                    "goal_id": rng.choice(goal_ids) if goal_ids and rng.random() < 0.5 else None,
+                    "user_id": account.id,
+                })
+            if rows:
+                conn.execute(insert(Task), rows)
+            if journals:
+                conn.execute(insert(Journal), [{
+                    "content": f"journal entry {n}", "user_id": account.id,
+                    "date": now - timedelta(days=n),
+                } for n in range(journals)])
+            account.open_task_ids = conn.execute(
+                select(Task.id).where(Task.user_id == account.id, Task.is_completed.is_(False))
+            ).scalars().all()
+            account.completed_task_ids = conn.execute(
+                select(Task.id).where(Task.user_id == account.id, Task.is_completed.is_(True))
+            ).scalars().all()
+            account.any_task_id = conn.execute(
+                select(Task.id).where(Task.user_id == account.id).limit(1)
+            ).scalar()
+    with Session(engine) as db:
+        rebuild_daily_stats(db)
+        db.commit()
+    return accounts
@@ -0,0 +1,67 @@
+"""Request scenarios for the API benchmark.
+
+Each scenario sends one request as ``user`` and returns the response.
+``REQUEST_SHARE`` scales the request count of scenarios that are too
+expensive to run as often as the others.
+"""
+from datetime import datetime, timedelta
+
+from .data import PASSWORD
+
+LEGACY_PREFIX = "/legacy"
+
+
+async def login(client, user, rng):
+    return await client.post("/api/auth/token", data={"username": user.email, "password": PASSWORD})
+
+
+async def dashboard(client, user, rng):
+    # Dashboard stats only exist on the legacy router, mounted by the runner.
+    return await client.get(f"{LEGACY_PREFIX}/dashboard/stats", headers=user.headers)
+
+
+async def list_tasks(client, user, rng):
+    return await client.get("/api/tasks/", params={"limit": 100}, headers=user.headers)
+
+
+async def create_task(client, user, rng):
+    start = datetime.utcnow() + timedelta(hours=rng.randint(1, 24 * 30))
+    return await client.post("/api/tasks/", headers=user.headers, json={
+        "title": "benchmark task", "points": rng.randint(1, 10),
+        "due_date": start.isoformat(), "start_time": start.isoformat(),
+        "end_time": (start + timedelta(minutes=30)).isoformat(),
+    })
+
+
+async def complete_task(client, user, rng):
+    # Complete a fresh task while there are any; afterwards this measures
+    # completing an already completed one.
+    task_id = user.open_task_ids.pop() if user.open_task_ids else user.any_task_id
+    return await client.put(f"/api/tasks/{task_id}/complete", headers=user.headers)
+
+
+async def update_task(client, user, rng):
+    task_id = rng.choice(user.open_task_ids or [user.any_task_id])
+    return await client.put(f"/api/tasks/{task_id}", headers=user.headers, json={
+        "title": f"renamed {rng.randrange(1000)}",
+    })
+
+
+async def delete_task(client, user, rng):
+    # Completed tasks, so the complete scenario never hits a deleted one.
+    task_id = user.completed_task_ids.pop() if user.completed_task_ids else 0
+    return await client.delete(f"/api/tasks/{task_id}", headers=user.headers)
+
+
+SCENARIOS = {
+    "login": login,
+    "dashboard": dashboard,
+    "list": list_tasks,
+    "create": create_task,
+    "complete": complete_task,
+    "update": update_task,
+    "delete": delete_task,
+}
+
+# Each login costs a bcrypt verification, ~100x any other request.
+REQUEST_SHARE = {"login": 0.1}
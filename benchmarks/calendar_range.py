@@ -0,0 +1,125 @@
+"""Calendar range query benchmark.
+
+Seeds a throwaway SQLite database with ``--tasks`` tasks for each of
+``--users`` users spread over three years (mostly short tasks, a few
+spanning several days), then times three ways of loading a calendar
+window for day, week and month views at the start, middle and end of
+that history:
+
+* ``all tasks``: what the calendar did before, loading every task of
+  the user and filtering client side;
+* ``single overlap``: one ``start_time < end AND end_time > start``
+  predicate;
+* ``range endpoint``: the two-branch query behind ``GET /api/tasks/range``.
+
+The end of the history stands in for the present, which is what the
+calendar shows most; the range query trades slower windows far in the
+past for fast ones there. It also prints the query plan of the range
+query and the payload size of the column-oriented response against a
+list of row objects:
+
+    python benchmarks/calendar_range.py --tasks 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_START = datetime(2024, 1, 1)
+HISTORY_DAYS = 3 * 365
+VIEWS = (("day", 1), ("week", 7), ("month", 42))
+
+
+def seed(engine, users, tasks_per_user):
+    from sqlalchemy import insert
+    from backend.app.models import Task, User
+
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"bench{n}@example.com", "hashed_password": "x", "points": 0}
+            for n in range(users)
+        ])
+        for user_id in range(1, users + 1):
+            rows = []
+            for n in range(tasks_per_user):
+                start = HISTORY_START + timedelta(minutes=rng.randrange(HISTORY_DAYS * 24 * 60))
+                if rng.random() < 0.01:
+                    length = timedelta(days=rng.randint(1, 14))
+                else:
+                    length = timedelta(minutes=rng.choice((15, 30, 60, 90, 120)))
+                rows.append({
+                    "title": f"task {n}", "points": 1, "is_completed": False,
+                    "due_date": start, "start_time": start, "end_time": start + length,
+                    "user_id": user_id,
+                })
+            conn.execute(insert(Task), rows)
+
+
+def timed(conn, query, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = sorted(conn.execute(query).all(), key=lambda row: (row.start_time, row.id))
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000, help="tasks per user")
+    parser.add_argument("--users", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    sys.path.insert(0, ROOT)
+    from sqlalchemy import select
+    from backend.app.api.endpoints.tasks import RANGE_COLUMNS, task_range_query
+    from backend.app.db.base_class import Base
+    from backend.app.db.session import engine
+    from backend.app.models import Task
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    seed(engine, args.users, args.tasks)
+    print(f"seeded {args.users} x {args.tasks} tasks in {time.perf_counter() - started:.1f}s")
+
+    user_id = 1
+    with engine.connect() as conn:
+        plan_query = task_range_query(user_id, HISTORY_START, HISTORY_START + timedelta(days=7))
+        compiled = plan_query.compile(engine, compile_kwargs={"literal_binds": True})
+        print("range query plan:")
+        for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}"):
+            print(f"  {row[-1]}")
+
+        everything = select(*RANGE_COLUMNS).where(Task.user_id == user_id)
+        all_ms, all_rows = timed(conn, everything, args.repeat)
+        print(f"\nall tasks: {len(all_rows)} rows in {all_ms:.1f}ms (independent of the window)\n")
+        print(f"{'view':<6} {'position':<8} {'rows':>6} {'single overlap':>15} {'range endpoint':>15}")
+        for view, days in VIEWS:
+            for position, offset in (("start", 0), ("middle", HISTORY_DAYS // 2), ("end", HISTORY_DAYS - days)):
+                start = HISTORY_START + timedelta(days=offset)
+                end = start + timedelta(days=days)
+                single = select(*RANGE_COLUMNS).where(
+                    Task.user_id == user_id, Task.start_time < end, Task.end_time > start
+                )
+                single_ms, expected = timed(conn, single, args.repeat)
+                range_ms, rows = timed(conn, task_range_query(user_id, start, end), args.repeat)
+                assert [row.id for row in rows] == [row.id for row in expected]
+                print(f"{view:<6} {position:<8} {len(rows):>6} {single_ms:>13.2f}ms {range_ms:>13.2f}ms")
+
+        keys = [column.key for column in RANGE_COLUMNS]
+        as_rows = json.dumps([dict(zip(keys, row)) for row in rows], default=str)
+        as_columns = json.dumps(dict(zip(keys, map(list, zip(*rows)))), default=str)
+        print(f"\nlast window payload: {len(as_rows)} bytes as rows, {len(as_columns)} bytes as columns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Concurrent task completion check.
+
+Seeds one user with ``--tasks`` open tasks, then completes every task
+``--repeat`` times at once through the ASGI app in-process, mixing
+single completions with batch requests, and checks that each task was
+credited exactly once: the user's balance, the sum of their
+``points_ledger`` entries, the dashboard rollup and the points of their
+tasks must all agree. Exits non-zero if they do not:
+
+    python benchmarks/concurrent_completions.py --tasks 200 --repeat 3
+    python benchmarks/concurrent_completions.py --legacy
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy import func, insert, select
+    from backend.main import app
+    from backend.app.db.session import engine
+    from backend.app.models import PointsLedger, Task, User, UserDailyStats
+
+    if args.legacy:
+        sys.path.insert(0, os.path.join(ROOT, "backend"))
+        import routes
+        app.include_router(routes.router, prefix="/legacy")
+
+    email, password = "bench@example.com", "bench-password"
+    rng = random.Random(7)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await client.post("/api/auth/register", json={"email": email, "password": password})
+        response = await client.post("/api/auth/token", data={"username": email, "password": password})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        when = datetime.utcnow() + timedelta(days=1)
+        with engine.begin() as conn:
+            user_id = conn.execute(select(User.id).where(User.email == email)).scalar_one()
+            conn.execute(insert(Task), [{
+                "title": f"task {n}", "points": rng.randint(1, 10), "due_date": when,
+                "start_time": when, "end_time": when, "user_id": user_id,
+            } for n in range(args.tasks)])
+            task_ids = conn.execute(select(Task.id).where(Task.user_id == user_id)).scalars().all()
+
+        async def complete(task_id):
+            if args.legacy:
+                return await client.put(f"/legacy/tasks/{task_id}/complete", headers=headers)
+            return await client.put(f"/api/tasks/{task_id}/complete", headers=headers)
+
+        async def complete_batch(ids):
+            operations = [{"op": "complete", "id": task_id} for task_id in ids]
+            return await client.post("/api/tasks/batch", json={"operations": operations}, headers=headers)
+
+        requests = [complete(task_id) for task_id in task_ids for _ in range(args.repeat)]
+        if not args.legacy:
+            shuffled = list(task_ids)
+            rng.shuffle(shuffled)
+            requests += [complete_batch(shuffled[n:n + 10]) for n in range(0, len(shuffled), 10)]
+        rng.shuffle(requests)
+        started = time.perf_counter()
+        responses = await asyncio.gather(*requests)
+        elapsed = time.perf_counter() - started
+
+    failed = [response.status_code for response in responses if response.status_code != 200]
+    with engine.connect() as conn:
+        balance = conn.execute(select(User.points).where(User.id == user_id)).scalar_one()
+        ledger = conn.execute(
+            select(func.count(), func.coalesce(func.sum(PointsLedger.delta), 0)).where(PointsLedger.user_id == user_id)
+        ).one()
+        earned, open_tasks = conn.execute(
+            select(func.sum(Task.points), func.count().filter(Task.is_completed.isnot(True)))
+            .where(Task.user_id == user_id)
+        ).one()
+        rollup_completed, rollup_points = conn.execute(
+            select(func.sum(UserDailyStats.completed), func.sum(UserDailyStats.points))
+            .where(UserDailyStats.user_id == user_id)
+        ).one()
+
+    print(f"{len(responses)} completion requests for {len(task_ids)} tasks in {elapsed:.2f}s, {len(failed)} failed")
+    print(f"task points {earned}, balance {balance}, ledger {ledger[1]} in {ledger[0]} entries, {open_tasks} tasks left open")
+    print(f"dashboard rollup: {rollup_completed} completed, {rollup_points} points")
+    ok = (
+        not failed and not open_tasks
+        and balance == earned == ledger[1] == rollup_points
+        and ledger[0] == len(task_ids) == rollup_completed
+    )
+    print("OK" if ok else "MISMATCH")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3, help="completions sent per task")
+    parser.add_argument("--legacy", action="store_true", help="use the legacy sync router")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    sys.path.insert(0, ROOT)
+    if not asyncio.run(run(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
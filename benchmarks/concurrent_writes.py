@@ -0,0 +1,102 @@
+"""Concurrent write load test for the SQLite session layer.
+
+Copies the local ``productivity_plus.db`` twice and hammers each copy
+with writer threads (one small transaction per task insert) while reader
+threads scan the tasks table. One copy uses a plain ``create_engine``;
+the other uses ``create_db_engine``, which adds the pool settings and
+the WAL/synchronous/mmap/busy-timeout pragmas:
+
+    python benchmarks/concurrent_writes.py --writers 8 --readers 4 --seconds 5
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only columns present in every historical tasks schema, so the script
+# works against whichever local database it is pointed at.
+INSERT_TASK = (
+    "INSERT INTO tasks (title, points, is_completed, due_date, start_time, end_time) "
+    "VALUES (:title, 1, 0, :now, :now, :now)"
+)
+
+
+def run_load(engine, writers, readers, seconds):
+    from sqlalchemy import text
+
+    stop = threading.Event()
+    counts = {"commits": 0, "errors": 0, "reads": 0}
+    lock = threading.Lock()
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def writer(worker_id):
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(INSERT_TASK), {
+                        "title": f"load {worker_id}",
+                        "now": "2026-01-01 09:00:00",
+                    })
+                bump("commits")
+            except Exception:
+                bump("errors")
+
+    def reader():
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT COUNT(*) FROM tasks WHERE is_completed = 0")).scalar()
+                bump("reads")
+            except Exception:
+                bump("errors")
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", default=os.path.join(ROOT, "productivity_plus.db"))
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from sqlalchemy import create_engine
+    from backend.app.db.session import create_db_engine
+
+    workdir = tempfile.mkdtemp()
+    modes = (
+        ("default create_engine", lambda url: create_engine(url, connect_args={"check_same_thread": False})),
+        ("create_db_engine", create_db_engine),
+    )
+    for label, factory in modes:
+        path = os.path.join(workdir, label.replace(" ", "_") + ".db")
+        shutil.copyfile(args.database, path)
+        counts = run_load(factory(f"sqlite:///{path}"), args.writers, args.readers, args.seconds)
+        print(
+            f"{label:>22}: {counts['commits'] / args.seconds:8.1f} commits/s "
+            f"{counts['reads'] / args.seconds:8.1f} reads/s  errors={counts['errors']}"
+        )
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
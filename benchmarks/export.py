@@ -0,0 +1,83 @@
+"""Streaming export memory check.
+
+Seeds a throwaway SQLite database with one user owning ``--rows`` tasks
+and as many journal entries, then drains the NDJSON and CSV exports
+without keeping the output, and reports throughput and the peak Python
+heap seen by ``tracemalloc``. The peak should track ``EXPORT_BATCH_SIZE``
+rather than ``--rows``; run it at two sizes to compare:
+
+    python benchmarks/export.py --rows 20000
+    python benchmarks/export.py --rows 200000 --gzip
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def seed(engine, rows):
+    from sqlalchemy import insert
+    from backend.app.models import Journal, Task, User
+
+    when = datetime(2026, 1, 1, 9)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@example.com", "hashed_password": "x", "points": 0}])
+        for start in range(0, rows, 10000):
+            batch = range(start, min(start + 10000, rows))
+            conn.execute(insert(Task), [{
+                "title": f"task {n}", "description": "a short description of the task",
+                "points": n % 10, "is_completed": n % 3 == 0, "goal_id": None,
+                "due_date": when + timedelta(hours=n), "start_time": when + timedelta(hours=n),
+                "end_time": when + timedelta(hours=n, minutes=30), "user_id": 1,
+            } for n in batch])
+            conn.execute(insert(Journal), [{
+                "content": f"journal entry {n} " * 8, "date": when + timedelta(days=n), "user_id": 1,
+            } for n in batch])
+
+
+async def drain(chunks):
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000, help="tasks and journal entries each")
+    parser.add_argument("--gzip", action="store_true", help="compress the output as the endpoint would")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "5000")
+    sys.path.insert(0, ROOT)
+    from backend.app.api.export import EXPORT_BATCH_SIZE, export_csv, export_ndjson, gzip_chunks
+    from backend.app.db.init_db import init_db
+    from backend.app.db.session import engine
+
+    init_db()
+    seed(engine, args.rows)
+    print(f"{args.rows} tasks and {args.rows} journal entries, batches of {EXPORT_BATCH_SIZE}")
+    print(f"{'export':<12} {'bytes':>12} {'seconds':>8} {'rows/s':>9} {'peak heap':>10}")
+    for label, rows, make in (
+        ("ndjson", 2 * args.rows + 1, lambda: export_ndjson(1)),
+        ("csv tasks", args.rows, lambda: export_csv(1, "tasks")),
+    ):
+        chunks = gzip_chunks(make()) if args.gzip else make()
+        tracemalloc.start()
+        started = time.perf_counter()
+        size = asyncio.run(drain(chunks))
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:<12} {size:>12} {elapsed:>8.2f} {rows / elapsed:>9.0f} {peak / 2 ** 20:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
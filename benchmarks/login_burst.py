@@ -0,0 +1,95 @@
+"""Login burst benchmark.
+
+Fires a burst of concurrent logins at the ASGI app in-process while a
+probe keeps calling an unrelated endpoint, then reports login throughput
+and the probe's latency percentiles. Run it once with the default worker
+pool and once with ``--workers 0`` (bcrypt inline on the event loop) to
+compare:
+
+    python benchmarks/login_burst.py --logins 50 --concurrency 25
+    python benchmarks/login_burst.py --logins 50 --concurrency 25 --workers 0
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE_INTERVAL = 0.005
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(args):
+    import httpx
+    from backend.main import app
+
+    email, password = "bench@example.com", "bench-password"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/auth/register", json={"email": email, "password": password})
+
+        done = asyncio.Event()
+        probe_latencies = []
+
+        async def probe():
+            # Latency is measured from when the request should have been
+            # sent, so time spent waiting on a blocked event loop counts.
+            while not done.is_set():
+                due = time.perf_counter() + PROBE_INTERVAL
+                await asyncio.sleep(PROBE_INTERVAL)
+                await client.get("/")
+                probe_latencies.append(time.perf_counter() - due)
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        statuses = []
+
+        async def login():
+            async with semaphore:
+                response = await client.post(
+                    "/api/auth/token", data={"username": email, "password": password}
+                )
+                statuses.append(response.status_code)
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(args.logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    ok = statuses.count(200)
+    print(f"password hash workers: {args.workers}")
+    print(f"logins: {ok}/{len(statuses)} ok in {elapsed:.2f}s ({ok / elapsed:.1f} logins/s)")
+    if probe_latencies:
+        ms = [sample * 1000 for sample in probe_latencies]
+        print(
+            f"unrelated endpoint during burst: n={len(ms)} "
+            f"p50={statistics.median(ms):.1f}ms p99={percentile(ms, 99):.1f}ms "
+            f"max={max(ms):.1f}ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS; 0 hashes inline")
+    args = parser.parse_args()
+
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_HASH_MAX_PENDING"] = str(max(args.concurrency, 1))
+    os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+    sys.path.insert(0, ROOT)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
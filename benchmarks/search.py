@@ -0,0 +1,109 @@
+"""Full-text search benchmark.
+
+Seeds a throwaway SQLite database with ``--entries`` tasks and journal
+entries (half each) spread over ``--users`` users, using a Zipf-like
+vocabulary so some words are common and most are rare, then times the
+search used by ``GET /api/search/`` for common, mid-frequency, rare
+and two-word queries across random users:
+
+    python benchmarks/search.py --entries 1000000 --users 1000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VOCABULARY_SIZE = 20_000
+CHUNK = 50_000
+
+
+def make_vocabulary(rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 9))))
+    return sorted(words)
+
+
+def seed(engine, entries, users, vocabulary, rng):
+    from sqlalchemy import insert
+    from backend.app.models import Journal, Task, User
+
+    cumulative, total = [], 0.0
+    for rank in range(len(vocabulary)):
+        total += 1 / (rank + 1)
+        cumulative.append(total)
+    when = datetime(2026, 1, 1)
+
+    def sentence(low, high):
+        return " ".join(rng.choices(vocabulary, cum_weights=cumulative, k=rng.randint(low, high)))
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"bench{n}@example.com", "hashed_password": "x", "points": 0}
+            for n in range(users)
+        ])
+        for offset in range(0, entries // 2, CHUNK):
+            count = min(CHUNK, entries // 2 - offset)
+            conn.execute(insert(Task), [{
+                "title": sentence(2, 6), "description": sentence(0, 20), "points": 1,
+                "is_completed": False, "due_date": when, "start_time": when, "end_time": when,
+                "user_id": rng.randint(1, users),
+            } for _ in range(count)])
+            conn.execute(insert(Journal), [{
+                "content": sentence(20, 80), "date": when, "user_id": rng.randint(1, users),
+            } for _ in range(count)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200, help="queries per kind")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    sys.path.insert(0, ROOT)
+    from backend.app.db.init_db import init_db
+    from backend.app.db.search import search
+    from backend.app.db.session import SessionLocal, engine
+
+    init_db()
+    rng = random.Random(7)
+    vocabulary = make_vocabulary(rng)
+    started = time.perf_counter()
+    seed(engine, args.entries, args.users, vocabulary, rng)
+    print(f"seeded and indexed {args.entries} entries in {time.perf_counter() - started:.1f}s")
+
+    kinds = {
+        "common word": lambda: vocabulary[rng.randrange(10)],
+        "rare word": lambda: vocabulary[rng.randrange(1000, VOCABULARY_SIZE)],
+        "mid word": lambda: vocabulary[rng.randrange(100, 1000)],
+        "two words": lambda: f"{vocabulary[rng.randrange(50)]} {vocabulary[rng.randrange(50, 500)]}",
+    }
+    db = SessionLocal()
+    try:
+        print(f"{'query':<12} {'hits/page':>9} {'p50':>8} {'p95':>8} {'max':>8}")
+        for label, make_query in kinds.items():
+            samples, hits = [], []
+            for _ in range(args.queries):
+                user_id, query = rng.randint(1, args.users), make_query()
+                before = time.perf_counter()
+                hits.append(len(search(db, user_id, query, limit=20)))
+                samples.append((time.perf_counter() - before) * 1000)
+            samples.sort()
+            print(
+                f"{label:<12} {statistics.mean(hits):>9.1f} {statistics.median(samples):>6.2f}ms "
+                f"{samples[int(len(samples) * 0.95) - 1]:>6.2f}ms {samples[-1]:>6.2f}ms"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""List serialization benchmark.
+
+Seeds a throwaway SQLite database with ``--tasks`` tasks for one user and
+times loading and encoding all of them to JSON bytes, the work behind a
+task list response, three ways:
+
+* ``response_model``: ORM objects validated and encoded by FastAPI from
+  the endpoint's ``response_model``, as the legacy routes do by default;
+* ``orm + adapter``: ORM objects dumped by a pre-built ``TypeAdapter``,
+  the default path of ``GET /api/tasks/``;
+* ``fast``: the ``FAST_SERIALIZATION`` path, plain rows of the schema's
+  columns dumped by the same adapter.
+
+    python benchmarks/serialization.py --tasks 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def seed(engine, tasks):
+    from sqlalchemy import insert
+    from backend.app.models import Task, User
+
+    when = datetime(2026, 1, 1, 9)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@example.com", "hashed_password": "x", "points": 0}])
+        conn.execute(insert(Task), [{
+            "title": f"task {n}", "description": "a short description of the task",
+            "points": n % 10, "is_completed": n % 3 == 0, "goal_id": None,
+            "due_date": when + timedelta(hours=n), "start_time": when + timedelta(hours=n),
+            "end_time": when + timedelta(hours=n, minutes=30), "user_id": 1,
+        } for n in range(tasks)])
+
+
+def time_it(run, repeat):
+    samples = []
+    for _ in range(repeat):
+        before = time.perf_counter()
+        body = run()
+        samples.append((time.perf_counter() - before) * 1000)
+    samples.sort()
+    return samples, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    sys.path.insert(0, ROOT)
+    from typing import List
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from backend.app.api import serialization
+    from backend.app.api.endpoints.tasks import task_serializer
+    from backend.app.db.init_db import init_db
+    from backend.app.db.session import SessionLocal, engine
+    from backend.app.models import Task
+    from backend.app.schemas import TaskResponse
+
+    init_db()
+    seed(engine, args.tasks)
+    field = create_response_field("Response_get_tasks", List[TaskResponse])
+    loop = asyncio.new_event_loop()
+    db = SessionLocal()
+
+    def load():
+        db.expunge_all()
+        result = db.execute(task_serializer.select().where(Task.user_id == 1).order_by(Task.due_date, Task.id))
+        return task_serializer.all(result)
+
+    def response_model():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=load()))
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    def adapter():
+        return task_serializer.dump(load())
+
+    try:
+        print(f"{'path':<16} {'bytes':>8} {'p50':>8} {'p95':>8}")
+        for label, fast, run in (
+            ("response_model", False, response_model),
+            ("orm + adapter", False, adapter),
+            ("fast", True, adapter),
+        ):
+            serialization.FAST_SERIALIZATION = fast
+            samples, size = time_it(run, args.repeat)
+            print(
+                f"{label:<16} {size:>8} {statistics.median(samples):>6.2f}ms "
+                f"{samples[int(len(samples) * 0.95) - 1]:>6.2f}ms"
+            )
+    finally:
+        db.close()
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
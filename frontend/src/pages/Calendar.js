@@ -16,8 +16,9 @@ import {
 } from '@mui/material';
 import { DateTimePicker } from '@mui/x-date-pickers';
 import { Calendar as BigCalendar, dateFnsLocalizer } from 'react-big-calendar';
-import { format, parse, startOfWeek, getDay } from 'date-fns';
+import { addDays, format, parse, startOfWeek, getDay } from 'date-fns';
 import 'react-big-calendar/lib/css/react-big-calendar.css';
+import { fetchPage } from '../services/pagination';
 
 const locales = {
   'en-US': require('date-fns/locale/en-US'),
@@ -31,9 +32,27 @@ const localizer = dateFnsLocalizer({
   locales,
 });
 
+const weekOf = (date) => {
+  const start = startOfWeek(date);
+  return { start, end: addDays(start, 7) };
+};
+
+// The range endpoint answers one list per column; turn it back into tasks.
+const tasksFromColumns = (columns) =>
+  columns.id.map((id, i) => ({
+    id,
+    title: columns.title[i],
+    start_time: columns.start_time[i],
+    end_time: columns.end_time[i],
+    is_completed: columns.is_completed[i],
+    points: columns.points[i],
+    goal_id: columns.goal_id[i],
+  }));
+
 function Calendar() {
   const [tasks, setTasks] = useState([]);
   const [goals, setGoals] = useState([]);
+  const [range, setRange] = useState(() => weekOf(new Date()));
   const [openDialog, setOpenDialog] = useState(false);
   const [selectedSlot, setSelectedSlot] = useState(null);
   const [formData, setFormData] = useState({
@@ -46,15 +65,25 @@ function Calendar() {
   });
 
   useEffect(() => {
-    fetchTasks();
     fetchGoals();
   }, []);
 
+  useEffect(() => {
+    fetchTasks();
+  }, [range]);
+
+  // Only the tasks overlapping the visible days are loaded.
   const fetchTasks = async () => {
     try {
-      const response = await fetch('/api/tasks/');
-      const data = await response.json();
-      setTasks(data);
+      const params = new URLSearchParams({
+        start: range.start.toISOString(),
+        end: range.end.toISOString(),
+      });
+      const response = await fetch(`/api/tasks/range?${params}`);
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+      setTasks(tasksFromColumns(await response.json()));
     } catch (error) {
       console.error('Error fetching tasks:', error);
     }
@@ -62,14 +91,20 @@ function Calendar() {
 
   const fetchGoals = async () => {
     try {
-      const response = await fetch('/api/goals/');
-      const data = await response.json();
-      setGoals(data);
+      // The goal picker offers the first page, which holds the goals due soonest.
+      const { items } = await fetchPage('/api/goals/');
+      setGoals(items);
     } catch (error) {
       console.error('Error fetching goals:', error);
     }
   };
 
+  // Week and day views pass the visible days, month view a { start, end } span.
+  const handleRangeChange = (visible) => {
+    const days = Array.isArray(visible) ? visible : [visible.start, visible.end];
+    setRange({ start: days[0], end: addDays(days[days.length - 1], 1) });
+  };
+
   const handleSelectSlot = (slotInfo) => {
     setSelectedSlot(slotInfo);
     setFormData({
@@ -140,6 +175,7 @@ function Calendar() {
           endAccessor="end"
           selectable
           onSelectSlot={handleSelectSlot}
+          onRangeChange={handleRangeChange}
           eventPropGetter={eventStyleGetter}
           views={['month', 'week', 'day']}
           defaultView="week"
@@ -23,9 +23,11 @@ import { DateTimePicker } from '@mui/x-date-pickers';
 import { Delete as DeleteIcon, Edit as EditIcon } from '@mui/icons-material';
 import { format } from 'date-fns';
 import config from '../config';
+import { fetchPage } from '../services/pagination';
 
 function Goals() {
   const [goals, setGoals] = useState([]);
+  const [goalsCursor, setGoalsCursor] = useState(null);
   const [openDialog, setOpenDialog] = useState(false);
   const [editingGoal, setEditingGoal] = useState(null);
   const [formData, setFormData] = useState({
@@ -39,20 +41,18 @@ function Goals() {
     fetchGoals();
   }, []);
 
-  const fetchGoals = async () => {
+  // Without a cursor the list is reloaded from the first page.
+  const fetchGoals = async (cursor = null) => {
     try {
       const token = localStorage.getItem('token');
-      const response = await fetch(`${config.API_BASE_URL}/api/goals/`, {
+      const { items, nextCursor } = await fetchPage(`${config.API_BASE_URL}/api/goals/`, cursor, {
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json',
         },
       });
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-      const data = await response.json();
-      setGoals(data);
+      setGoals((loaded) => (cursor ? [...loaded, ...items] : items));
+      setGoalsCursor(nextCursor);
     } catch (error) {
       console.error('Error fetching goals:', error);
     }
@@ -227,6 +227,14 @@ function Goals() {
         ))}
       </Grid>
 
+      {goalsCursor && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 3 }}>
+          <Button variant="outlined" onClick={() => fetchGoals(goalsCursor)}>
+            Load more
+          </Button>
+        </Box>
+      )}
+
       <Dialog open={openDialog} onClose={handleCloseDialog} maxWidth="sm" fullWidth>
         <DialogTitle>
           {editingGoal ? 'Edit Goal' : 'Create New Goal'}
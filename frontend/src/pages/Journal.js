@@ -17,9 +17,11 @@ import {
 import { DateTimePicker } from '@mui/x-date-pickers';
 import { Delete as DeleteIcon, Edit as EditIcon } from '@mui/icons-material';
 import { format } from 'date-fns';
+import { fetchPage } from '../services/pagination';
 
 function Journal() {
   const [entries, setEntries] = useState([]);
+  const [entriesCursor, setEntriesCursor] = useState(null);
   const [openDialog, setOpenDialog] = useState(false);
   const [editingEntry, setEditingEntry] = useState(null);
   const [formData, setFormData] = useState({
@@ -31,11 +33,12 @@ function Journal() {
     fetchEntries();
   }, []);
 
-  const fetchEntries = async () => {
+  // Without a cursor the list is reloaded from the first page.
+  const fetchEntries = async (cursor = null) => {
     try {
-      const response = await fetch('/api/journals/');
-      const data = await response.json();
-      setEntries(data);
+      const { items, nextCursor } = await fetchPage('/api/journals/', cursor);
+      setEntries((loaded) => (cursor ? [...loaded, ...items] : items));
+      setEntriesCursor(nextCursor);
     } catch (error) {
       console.error('Error fetching journal entries:', error);
     }
@@ -171,6 +174,14 @@ function Journal() {
         ))}
       </Grid>
 
+      {entriesCursor && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 3 }}>
+          <Button variant="outlined" onClick={() => fetchEntries(entriesCursor)}>
+            Load more
+          </Button>
+        </Box>
+      )}
+
       <Dialog open={openDialog} onClose={handleCloseDialog} maxWidth="md" fullWidth>
         <DialogTitle>
           {editingEntry ? 'Edit Journal Entry' : 'New Journal Entry'}
@@ -27,9 +27,11 @@ import { DateTimePicker } from '@mui/x-date-pickers';
 import { Delete as DeleteIcon, Edit as EditIcon } from '@mui/icons-material';
 import { format } from 'date-fns';
 import config from '../config';
+import { fetchPage } from '../services/pagination';
 
 function Tasks() {
   const [tasks, setTasks] = useState([]);
+  const [tasksCursor, setTasksCursor] = useState(null);
   const [goals, setGoals] = useState([]);
   const [openDialog, setOpenDialog] = useState(false);
   const [editingTask, setEditingTask] = useState(null);
@@ -49,20 +51,18 @@ function Tasks() {
     fetchGoals();
   }, []);
 
-  const fetchTasks = async () => {
+  // Without a cursor the list is reloaded from the first page.
+  const fetchTasks = async (cursor = null) => {
     try {
       const token = localStorage.getItem('token');
-      const response = await fetch(`${config.API_BASE_URL}/api/tasks/`, {
+      const { items, nextCursor } = await fetchPage(`${config.API_BASE_URL}/api/tasks/`, cursor, {
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json',
         },
       });
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-      const data = await response.json();
-      setTasks(data);
+      setTasks((loaded) => (cursor ? [...loaded, ...items] : items));
+      setTasksCursor(nextCursor);
       setError('');
     } catch (error) {
       console.error('Error fetching tasks:', error);
@@ -73,17 +73,14 @@ function Tasks() {
   const fetchGoals = async () => {
     try {
       const token = localStorage.getItem('token');
-      const response = await fetch(`${config.API_BASE_URL}/api/goals/`, {
+      // The goal picker offers the first page, which holds the goals due soonest.
+      const { items } = await fetchPage(`${config.API_BASE_URL}/api/goals/`, null, {
         headers: {
           'Authorization': `Bearer ${token}`,
           'Content-Type': 'application/json',
         },
       });
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
-      const data = await response.json();
-      setGoals(data);
+      setGoals(items);
       setError('');
     } catch (error) {
       console.error('Error fetching goals:', error);
@@ -279,6 +276,14 @@ function Tasks() {
         ))}
       </Grid>
 
+      {tasksCursor && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 3 }}>
+          <Button variant="outlined" onClick={() => fetchTasks(tasksCursor)}>
+            Load more
+          </Button>
+        </Box>
+      )}
+
       <Dialog open={openDialog} onClose={handleCloseDialog} maxWidth="sm" fullWidth>
         <DialogTitle>
           {editingTask ? 'Edit Task' : 'Create New Task'}
@@ -0,0 +1,17 @@
+export const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+// List endpoints return one page at a time and send the cursor for the next
+// page in the X-Next-Cursor header; it is null on the last page. Pages are
+// fetched on demand, so long histories are never downloaded in one go.
+export const fetchPage = async (url, cursor = null, options = {}) => {
+  const separator = url.includes('?') ? '&' : '?';
+  const pageUrl = cursor ? `${url}${separator}cursor=${encodeURIComponent(cursor)}` : url;
+  const response = await fetch(pageUrl, options);
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`);
+  }
+  return {
+    items: await response.json(),
+    nextCursor: response.headers.get(NEXT_CURSOR_HEADER),
+  };
+};
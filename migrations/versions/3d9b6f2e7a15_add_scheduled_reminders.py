@@ -0,0 +1,34 @@
+"""Add scheduled reminders
+
+Revision ID: 3d9b6f2e7a15
+Revises: e1a47c9d3f08
+Create Date: 2026-10-17 14:22:53.104877
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d9b6f2e7a15'
+down_revision = 'e1a47c9d3f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('scheduled_reminders',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('user_email', sa.String(), nullable=False),
+    sa.Column('remind_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    with op.batch_alter_table('scheduled_reminders', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scheduled_reminders_remind_at'), ['remind_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('scheduled_reminders', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_scheduled_reminders_remind_at'))
+
+    op.drop_table('scheduled_reminders')
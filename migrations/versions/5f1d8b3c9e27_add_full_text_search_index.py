@@ -0,0 +1,102 @@
+"""Add full-text search index
+
+Revision ID: 5f1d8b3c9e27
+Revises: 9a4c2e7b5d31
+Create Date: 2026-10-17 15:41:06.318552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f1d8b3c9e27'
+down_revision = '9a4c2e7b5d31'
+branch_labels = None
+depends_on = None
+
+
+# The statements are spelled out here rather than imported from
+# backend.app.db.search, so later changes there cannot alter this revision.
+# rowid = (user_id << 32) + 2 * id for tasks, + 1 for journals.
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "title, body, tokenize = 'porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_search_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO search_index (rowid, title, body) "
+    "VALUES ((coalesce(new.user_id, 0) << 32) + new.id * 2, new.title, coalesce(new.description, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_search_update AFTER UPDATE OF title, description, user_id ON tasks BEGIN "
+    "DELETE FROM search_index WHERE rowid = (coalesce(old.user_id, 0) << 32) + old.id * 2; "
+    "INSERT INTO search_index (rowid, title, body) "
+    "VALUES ((coalesce(new.user_id, 0) << 32) + new.id * 2, new.title, coalesce(new.description, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_search_delete AFTER DELETE ON tasks BEGIN "
+    "DELETE FROM search_index WHERE rowid = (coalesce(old.user_id, 0) << 32) + old.id * 2; END",
+    "CREATE TRIGGER IF NOT EXISTS journals_search_insert AFTER INSERT ON journals BEGIN "
+    "INSERT INTO search_index (rowid, title, body) "
+    "VALUES ((coalesce(new.user_id, 0) << 32) + new.id * 2 + 1, '', coalesce(new.content, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS journals_search_update AFTER UPDATE OF content, user_id ON journals BEGIN "
+    "DELETE FROM search_index WHERE rowid = (coalesce(old.user_id, 0) << 32) + old.id * 2 + 1; "
+    "INSERT INTO search_index (rowid, title, body) "
+    "VALUES ((coalesce(new.user_id, 0) << 32) + new.id * 2 + 1, '', coalesce(new.content, '')); END",
+    "CREATE TRIGGER IF NOT EXISTS journals_search_delete AFTER DELETE ON journals BEGIN "
+    "DELETE FROM search_index WHERE rowid = (coalesce(old.user_id, 0) << 32) + old.id * 2 + 1; END",
+)
+
+SQLITE_BACKFILL = (
+    "DELETE FROM search_index",
+    "INSERT INTO search_index (rowid, title, body) "
+    "SELECT (coalesce(tasks.user_id, 0) << 32) + tasks.id * 2, title, coalesce(description, '') FROM tasks",
+    "INSERT INTO search_index (rowid, title, body) "
+    "SELECT (coalesce(journals.user_id, 0) << 32) + journals.id * 2 + 1, '', coalesce(content, '') FROM journals",
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS tasks_search_insert",
+    "DROP TRIGGER IF EXISTS tasks_search_update",
+    "DROP TRIGGER IF EXISTS tasks_search_delete",
+    "DROP TRIGGER IF EXISTS journals_search_insert",
+    "DROP TRIGGER IF EXISTS journals_search_update",
+    "DROP TRIGGER IF EXISTS journals_search_delete",
+    "DROP TABLE IF EXISTS search_index",
+)
+
+POSTGRES_DDL = (
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING gin (search_vector)",
+    "ALTER TABLE journals ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "to_tsvector('english', coalesce(content, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_journals_search_vector ON journals USING gin (search_vector)",
+)
+
+POSTGRES_DROP = (
+    "DROP INDEX IF EXISTS ix_journals_search_vector",
+    "ALTER TABLE journals DROP COLUMN IF EXISTS search_vector",
+    "DROP INDEX IF EXISTS ix_tasks_search_vector",
+    "ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector",
+)
+
+
+def upgrade() -> None:
+    # SQLite: FTS5 table plus sync triggers, backfilled from existing rows.
+    # Postgres: generated tsvector columns with GIN indexes.
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        exists = bind.execute(sa.text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+        )).first()
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        if not exists:
+            for statement in SQLITE_BACKFILL:
+                op.execute(statement)
+    elif bind.dialect.name == "postgresql":
+        for statement in POSTGRES_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    statements = {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP}.get(op.get_bind().dialect.name, ())
+    for statement in statements:
+        op.execute(statement)
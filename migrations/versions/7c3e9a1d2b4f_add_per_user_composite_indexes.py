@@ -0,0 +1,42 @@
+"""Add per-user composite indexes
+
+Revision ID: 7c3e9a1d2b4f
+Revises: 48200b5f5ebf
+Create Date: 2026-10-17 10:12:41.503219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e9a1d2b4f'
+down_revision = '48200b5f5ebf'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_user_id_due_date', ['user_id', 'due_date'], unique=False)
+        batch_op.create_index('ix_tasks_user_id_is_completed', ['user_id', 'is_completed'], unique=False)
+        batch_op.create_index(batch_op.f('ix_tasks_goal_id'), ['goal_id'], unique=False)
+
+    with op.batch_alter_table('goals', schema=None) as batch_op:
+        batch_op.create_index('ix_goals_user_id_target_date', ['user_id', 'target_date'], unique=False)
+
+    with op.batch_alter_table('journals', schema=None) as batch_op:
+        batch_op.create_index('ix_journals_user_id_date', ['user_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('journals', schema=None) as batch_op:
+        batch_op.drop_index('ix_journals_user_id_date')
+
+    with op.batch_alter_table('goals', schema=None) as batch_op:
+        batch_op.drop_index('ix_goals_user_id_target_date')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tasks_goal_id'))
+        batch_op.drop_index('ix_tasks_user_id_is_completed')
+        batch_op.drop_index('ix_tasks_user_id_due_date')
@@ -0,0 +1,28 @@
+"""Add task time range indexes
+
+Revision ID: 9a4c2e7b5d31
+Revises: 3d9b6f2e7a15
+Create Date: 2026-10-17 15:08:19.662340
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4c2e7b5d31'
+down_revision = '3d9b6f2e7a15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_user_id_start_time', ['user_id', 'start_time'], unique=False)
+        batch_op.create_index('ix_tasks_user_id_end_time', ['user_id', 'end_time'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_user_id_end_time')
+        batch_op.drop_index('ix_tasks_user_id_start_time')
@@ -0,0 +1,42 @@
+"""Add user_daily_stats rollup
+
+Revision ID: b52f0e8c61a3
+Revises: 7c3e9a1d2b4f
+Create Date: 2026-10-17 11:03:18.227404
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b52f0e8c61a3'
+down_revision = '7c3e9a1d2b4f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('user_daily_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('points', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+    # Backfill from existing tasks; later writes keep it up to date.
+    op.execute(
+        "INSERT INTO user_daily_stats (user_id, day, total, completed, points) "
+        "SELECT user_id, date(due_date), COUNT(id), "
+        "SUM(CASE WHEN is_completed THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN is_completed THEN COALESCE(points, 0) ELSE 0 END) "
+        "FROM tasks WHERE user_id IS NOT NULL AND due_date IS NOT NULL "
+        "GROUP BY user_id, date(due_date)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_daily_stats')
@@ -0,0 +1,48 @@
+"""Add points ledger
+
+Revision ID: c8e2f4a6b1d9
+Revises: 5f1d8b3c9e27
+Create Date: 2026-10-17 17:24:51.308412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e2f4a6b1d9'
+down_revision = '5f1d8b3c9e27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('points_ledger',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('delta', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('points_ledger', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_points_ledger_id'), ['id'], unique=False)
+        batch_op.create_index('ix_points_ledger_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    # Open the ledger with each user's current balance so that it sums to
+    # users.points from the start.
+    op.execute(
+        "INSERT INTO points_ledger (user_id, task_id, delta, reason) "
+        "SELECT id, NULL, points, 'opening_balance' FROM users "
+        "WHERE points IS NOT NULL AND points <> 0"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('points_ledger', schema=None) as batch_op:
+        batch_op.drop_index('ix_points_ledger_user_id_created_at')
+        batch_op.drop_index(batch_op.f('ix_points_ledger_id'))
+
+    op.drop_table('points_ledger')
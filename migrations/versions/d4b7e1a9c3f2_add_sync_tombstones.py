@@ -0,0 +1,67 @@
+"""Add updated_at columns, their indexes and sync tombstones
+
+Revision ID: d4b7e1a9c3f2
+Revises: c8e2f4a6b1d9
+Create Date: 2026-10-17 18:02:13.645120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4b7e1a9c3f2'
+down_revision = 'c8e2f4a6b1d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The models have always declared these columns, but no migration added
+    # them, and sync selects every column of users, tasks and goals.
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True))
+
+    with op.batch_alter_table('goals', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True))
+        batch_op.create_index('ix_goals_user_id_updated_at', ['user_id', 'updated_at'], unique=False)
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('completed_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True))
+        batch_op.create_index('ix_tasks_user_id_updated_at', ['user_id', 'updated_at'], unique=False)
+
+    op.create_table('tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tombstones_id'), ['id'], unique=False)
+        batch_op.create_index('ix_tombstones_user_id_deleted_at', ['user_id', 'deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tombstones', schema=None) as batch_op:
+        batch_op.drop_index('ix_tombstones_user_id_deleted_at')
+        batch_op.drop_index(batch_op.f('ix_tombstones_id'))
+
+    op.drop_table('tombstones')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_user_id_updated_at')
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('completed_at')
+
+    with op.batch_alter_table('goals', schema=None) as batch_op:
+        batch_op.drop_index('ix_goals_user_id_updated_at')
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('created_at')
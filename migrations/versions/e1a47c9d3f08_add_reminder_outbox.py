@@ -0,0 +1,39 @@
+"""Add reminder outbox
+
+Revision ID: e1a47c9d3f08
+Revises: b52f0e8c61a3
+Create Date: 2026-10-17 13:41:06.918352
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a47c9d3f08'
+down_revision = 'b52f0e8c61a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('reminder_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('user_email', sa.String(), nullable=False),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('remind_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('reminder_outbox', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_reminder_outbox_id'), ['id'], unique=False)
+        batch_op.create_index('ix_reminder_outbox_task_id', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('reminder_outbox', schema=None) as batch_op:
+        batch_op.drop_index('ix_reminder_outbox_task_id')
+        batch_op.drop_index(batch_op.f('ix_reminder_outbox_id'))
+
+    op.drop_table('reminder_outbox')
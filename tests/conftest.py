@@ -0,0 +1,85 @@
+"""Shared fixtures.
+
+The app reads ``DATABASE_URL`` when ``backend`` is first imported, so it
+is pointed at a throwaway SQLite file here, before any test imports it.
+Tests share that database and keep apart by each using their own users.
+"""
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEGACY_PREFIX = "/legacy"
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from backend.app.db.init_db import init_db
+    from backend.app.db.session import engine
+
+    init_db()
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    from backend.app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """Create users with unique emails."""
+    from backend.app.models import User
+
+    def make():
+        account = User(email=f"{uuid.uuid4().hex}@example.com", hashed_password="x", is_active=True, points=0)
+        db.add(account)
+        db.commit()
+        return account
+
+    return make
+
+
+@pytest.fixture
+def user(make_user):
+    return make_user()
+
+
+@pytest.fixture
+def auth_headers(user):
+    from backend.auth import create_access_token
+
+    return {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+
+
+@pytest.fixture(scope="session")
+def app(engine):
+    """The API with the legacy router mounted under ``LEGACY_PREFIX``."""
+    from backend.main import app
+
+    # The legacy router imports its siblings as top-level modules.
+    sys.path.insert(0, os.path.join(ROOT, "backend"))
+    import routes
+
+    app.include_router(routes.router, prefix=LEGACY_PREFIX)
+    return app
+
+
+@pytest.fixture
+def client(app):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as test_client:
+        yield test_client
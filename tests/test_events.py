@@ -0,0 +1,107 @@
+import asyncio
+import json
+from datetime import timedelta
+
+from sqlalchemy import update
+
+import pytest
+
+from backend.app.api.endpoints import events
+from backend.app.api.events import RedisBackend, change_feed
+from backend.app.models import User
+from backend.auth import create_access_token, invalidate_cached_user
+from tests.conftest import LEGACY_PREFIX
+
+
+async def read_stream(stream, on_open=None, timeout=10):
+    """Collect a stream's chunks until it ends; ``on_open`` runs after the first."""
+    chunks = []
+
+    async def consume():
+        async for chunk in stream:
+            chunks.append(chunk)
+            if len(chunks) == 1 and on_open is not None:
+                await on_open()
+
+    await asyncio.wait_for(consume(), timeout)
+    return chunks
+
+
+def test_stream_relays_events_and_ends_when_the_token_expires(engine, user):
+    token = create_access_token({"sub": user.email}, timedelta(seconds=2))
+
+    async def publish():
+        await change_feed.publish(user.id, "task", "deleted", 5)
+
+    chunks = asyncio.run(read_stream(events.event_stream(user.id, token), publish))
+
+    assert chunks[0].startswith("retry:")
+    data = [json.loads(chunk[len("data: "):]) for chunk in chunks if chunk.startswith("data: ")]
+    assert data == [{"type": "task", "op": "deleted", "id": 5}]
+
+
+def test_stream_ends_when_the_user_is_deactivated(engine, db, user, monkeypatch):
+    monkeypatch.setattr(events, "CHANGE_FEED_KEEPALIVE_SECONDS", 0.1)
+    token = create_access_token({"sub": user.email}, timedelta(minutes=30))
+
+    async def deactivate():
+        db.execute(update(User).where(User.id == user.id).values(is_active=False))
+        db.commit()
+        invalidate_cached_user(user.email)
+
+    chunks = asyncio.run(read_stream(events.event_stream(user.id, token), deactivate, timeout=5))
+    assert all(not chunk.startswith("data:") for chunk in chunks)
+
+
+class RecordingBackend:
+    def __init__(self):
+        self.events = []
+
+    def listening(self, user_id):
+        return True
+
+    async def publish(self, user_id, message):
+        self.events.append(json.loads(message))
+
+
+def test_both_routers_publish_one_task_shape(client, auth_headers, monkeypatch):
+    recorder = RecordingBackend()
+    monkeypatch.setattr(change_feed, "backend", recorder)
+    when = "2026-11-01T09:00:00"
+    body = {"title": "stretch", "due_date": when, "start_time": when, "end_time": when}
+
+    assert client.post("/api/tasks/", json=body, headers=auth_headers).status_code == 200
+    assert client.post(f"{LEGACY_PREFIX}/tasks/", json=body, headers=auth_headers).status_code == 200
+
+    app_event, legacy_event = recorder.events
+    assert app_event["data"].keys() == legacy_event["data"].keys()
+
+
+class StopListening(Exception):
+    pass
+
+
+class FakePubSub:
+    def __init__(self, items):
+        self.items = items
+
+    def subscribe(self, channel):
+        pass
+
+    def listen(self):
+        yield from self.items
+        raise StopListening
+
+
+def test_listener_skips_malformed_messages():
+    pytest.importorskip("redis")
+    backend = RedisBackend.__new__(RedisBackend)
+    backend.channel = "changes"
+    delivered = []
+    backend.local = type("Local", (), {"deliver": lambda self, user_id, message: delivered.append((user_id, message))})()
+    items = [{"data": b"not-a-user:{}"}, {"type": "message"}, {"data": b"7:{\"type\":\"resync\"}"}]
+    backend.client = type("Client", (), {"pubsub": lambda self, **kwargs: FakePubSub(items)})()
+
+    with pytest.raises(StopListening):
+        backend._listen()
+    assert delivered == [(7, '{"type":"resync"}')]
@@ -0,0 +1,27 @@
+"""Exports stream on one pooled connection."""
+import json
+
+from backend.app.api import export
+from backend.app.db.session import async_engine
+
+
+def test_export_holds_one_connection(client, auth_headers, monkeypatch):
+    checked_out = []
+    stream_batches = export.stream_batches
+
+    async def recording(db, model, user_id):
+        checked_out.append(async_engine.pool.checkedout())
+        async for batch in stream_batches(db, model, user_id):
+            yield batch
+
+    monkeypatch.setattr(export, "stream_batches", recording)
+    # The principal is not cached yet, so authenticating reads the user.
+    response = client.get("/api/export/", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[0])["type"] == "user"
+    assert checked_out == [1, 1, 1]
+
+
+def test_export_needs_a_token(client):
+    assert client.get("/api/export/").status_code == 401
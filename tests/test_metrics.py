@@ -0,0 +1,23 @@
+"""Streamed responses are kept out of the request latency histogram."""
+from prometheus_client import REGISTRY
+
+
+def observed(metric, route):
+    return REGISTRY.get_sample_value(f"{metric}_count", {"method": "GET", "route": route}) or 0
+
+
+def test_streams_are_timed_apart_from_requests(client, auth_headers):
+    before = {
+        name: (observed("http_request_duration_seconds", route), observed("http_stream_duration_seconds", route))
+        for name, route in (("export", "/api/export/"), ("tasks", "/api/tasks/"))
+    }
+
+    assert client.get("/api/export/", headers=auth_headers).status_code == 200
+    assert client.get("/api/tasks/", headers=auth_headers).status_code == 200
+
+    export_requests, export_streams = before["export"]
+    assert observed("http_request_duration_seconds", "/api/export/") == export_requests
+    assert observed("http_stream_duration_seconds", "/api/export/") == export_streams + 1
+    task_requests, task_streams = before["tasks"]
+    assert observed("http_request_duration_seconds", "/api/tasks/") == task_requests + 1
+    assert observed("http_stream_duration_seconds", "/api/tasks/") == task_streams
@@ -0,0 +1,92 @@
+"""Task and goal mutations are single UPDATE/DELETE ... RETURNING statements."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.db.mutations import delete_owned, update_owned
+from backend.app.db.query_count import assert_max_queries, count_queries
+from backend.app.db.session import async_engine
+from backend.app.models import Goal
+
+
+def when(days=7):
+    return (datetime.utcnow() + timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def task(client, auth_headers):
+    # Creating through the API also caches the principal, so the requests
+    # under test do not look the user up.
+    body = {"title": "draft", "points": 2, "due_date": when(), "start_time": when(), "end_time": when()}
+    return client.post("/api/tasks/", json=body, headers=auth_headers).json()
+
+
+@pytest.fixture
+def goal(client, auth_headers):
+    body = {"title": "run a marathon", "goal_type": "yearly", "target_date": when(90)}
+    return client.post("/api/goals/", json=body, headers=auth_headers).json()
+
+
+def test_title_update_is_one_statement(client, auth_headers, task):
+    with assert_max_queries(async_engine, 1):
+        response = client.put(f"/api/tasks/{task['id']}", json={"title": "final"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["title"] == "final"
+
+
+def test_goal_update_is_one_statement(client, auth_headers, goal):
+    with assert_max_queries(async_engine, 1):
+        response = client.put(f"/api/goals/{goal['id']}", json={"title": "run two"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["title"] == "run two"
+
+
+def test_goal_delete_is_one_delete(client, auth_headers, goal):
+    with count_queries(async_engine) as counter:
+        response = client.delete(f"/api/goals/{goal['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    # Besides the DELETE, only the tombstone that delta sync reports.
+    statements = [statement.split()[:3] for statement in counter.statements]
+    assert statements == [["DELETE", "FROM", "goals"], ["INSERT", "INTO", "tombstones"]], counter.report()
+
+
+def test_foreign_goal_is_404_in_one_statement(client, auth_headers, db, make_user):
+    other = Goal(title="theirs", goal_type="monthly", target_date=datetime.utcnow(), user_id=make_user().id)
+    db.add(other)
+    db.commit()
+    client.get("/api/goals/", headers=auth_headers)  # caches the principal
+    with assert_max_queries(async_engine, 1):
+        response = client.put(f"/api/goals/{other.id}", json={"title": "mine"}, headers=auth_headers)
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def without_returning(db, monkeypatch):
+    dialect = db.get_bind().dialect
+    monkeypatch.setattr(dialect, "update_returning", False)
+    monkeypatch.setattr(dialect, "delete_returning", False)
+
+
+def test_fallback_without_returning(db, make_user, without_returning):
+    owner, other = make_user().id, make_user().id
+    goal = Goal(title="learn", goal_type="monthly", target_date=datetime.utcnow(), user_id=owner)
+    db.add(goal)
+    db.commit()
+    goal_id = goal.id
+    engine = db.get_bind()
+
+    # UPDATE, then SELECT the updated row.
+    with assert_max_queries(engine, 2):
+        row = update_owned(db, Goal, goal_id, owner, {"title": "learn more"})
+    assert (row.id, row.title) == (goal_id, "learn more")
+    with assert_max_queries(engine, 1):
+        assert update_owned(db, Goal, goal_id, other, {"title": "stolen"}) is None
+
+    # SELECT ... FOR UPDATE, then DELETE.
+    with assert_max_queries(engine, 1):
+        assert delete_owned(db, Goal, goal_id, other) is None
+    with assert_max_queries(engine, 2):
+        row = delete_owned(db, Goal, goal_id, owner, Goal.id, Goal.title)
+    assert (row.id, row.title) == (goal_id, "learn more")
+    db.commit()
+    assert db.get(Goal, goal_id) is None
@@ -0,0 +1,31 @@
+"""The outbox sweep schedules every live reminder, including overdue ones."""
+from datetime import datetime, timedelta
+
+from backend.app.db.outbox import (
+    REMINDER_GRACE_PERIOD,
+    SCHEDULE,
+    apply_outbox,
+    claim_due_reminders,
+)
+from backend.app.models import ReminderOutbox, ScheduledReminder
+
+TASK_IDS = (900001, 900002, 900003)
+
+
+def test_overdue_entry_is_still_sent(db):
+    now = datetime.utcnow()
+    overdue, upcoming, stale = TASK_IDS
+    db.add_all([
+        # Written just before the sweep, or while beat was down.
+        ReminderOutbox(task_id=overdue, user_email="late@example.com", action=SCHEDULE, remind_at=now - timedelta(minutes=5)),
+        ReminderOutbox(task_id=upcoming, user_email="soon@example.com", action=SCHEDULE, remind_at=now + timedelta(hours=1)),
+        ReminderOutbox(task_id=stale, user_email="old@example.com", action=SCHEDULE, remind_at=now - 2 * REMINDER_GRACE_PERIOD),
+    ])
+    db.flush()
+
+    apply_outbox(db, 100)
+    scheduled = {row.task_id for row in db.query(ScheduledReminder).filter(ScheduledReminder.task_id.in_(TASK_IDS))}
+    assert scheduled == {overdue, upcoming}
+
+    due = claim_due_reminders(db, now + timedelta(minutes=1), 100)
+    assert [row.task_id for row in due if row.task_id in TASK_IDS] == [overdue]
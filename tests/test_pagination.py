@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from backend.app.api.pagination import apply_keyset, split_page
+from backend.app.models import Journal, Task
+
+from tests.conftest import LEGACY_PREFIX
+
+
+def pages(db, model, sort_column, sort_attr, user_id, limit):
+    """Follow cursors from the first page to the last; return the pages' ids."""
+    cursor, result = None, []
+    while True:
+        query = apply_keyset(select(model).where(model.user_id == user_id), sort_column, model.id, cursor, limit)
+        rows, cursor = split_page(db.execute(query).scalars().all(), limit, sort_attr)
+        result.append([row.id for row in rows])
+        if cursor is None:
+            return result
+
+
+def test_pages_cover_every_row_once_in_order(db, user):
+    start = datetime(2026, 1, 1)
+    db.add_all(Task(
+        title=f"task {n}", due_date=start + timedelta(days=n % 3), start_time=start, end_time=start, user_id=user.id,
+    ) for n in range(7))
+    db.commit()
+
+    expected = db.execute(
+        select(Task.id).where(Task.user_id == user.id).order_by(Task.due_date, Task.id)
+    ).scalars().all()
+    result = pages(db, Task, Task.due_date, "due_date", user.id, limit=3)
+    assert [len(page) for page in result] == [3, 3, 1]
+    assert sum(result, []) == expected
+
+
+def test_null_sort_values_are_paged_first(db, user):
+    dated = [Journal(content=f"dated {n}", date=datetime(2026, 1, 1) + timedelta(days=n), user_id=user.id) for n in range(3)]
+    undated = [Journal(content=f"undated {n}", user_id=user.id) for n in range(3)]
+    db.add_all(dated + undated)
+    db.flush()
+    # Inserts fill a missing date from the column default; clear it afterwards.
+    db.execute(update(Journal).where(Journal.id.in_([entry.id for entry in undated])).values(date=None))
+    db.commit()
+
+    # A page ends inside the NULL block and the next one must continue it.
+    result = pages(db, Journal, Journal.date, "date", user.id, limit=2)
+    assert sum(result, []) == [entry.id for entry in undated + dated]
+
+
+def test_legacy_journal_list_pages_undated_entries(client, db, user, auth_headers):
+    entries = [Journal(content=f"entry {n}", user_id=user.id) for n in range(3)]
+    db.add_all(entries)
+    db.flush()
+    db.execute(update(Journal).where(Journal.id == entries[0].id).values(date=None))
+    db.commit()
+
+    response = client.get(f"{LEGACY_PREFIX}/journals/?limit=2", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()[0] == {"id": entries[0].id, "user_id": user.id, "content": "entry 0", "date": None}
+    cursor = response.headers["X-Next-Cursor"]
+    rest = client.get(f"{LEGACY_PREFIX}/journals/?limit=2&cursor={cursor}", headers=auth_headers).json()
+    assert [entry["id"] for entry in rest] == [entries[2].id]
@@ -0,0 +1,100 @@
+"""Task completion credits points exactly once."""
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import func, insert, select
+
+from backend.app.models import PointsLedger, Task, User, UserDailyStats
+from backend.auth import principal_cache
+from tests.conftest import LEGACY_PREFIX
+
+TASKS = 200
+REPEAT = 3
+
+
+def new_task(points=5):
+    when = (datetime.utcnow() + timedelta(days=1)).isoformat()
+    return {"title": "file taxes", "points": points, "due_date": when, "start_time": when, "end_time": when}
+
+
+def test_parallel_completions_credit_each_task_once(app, engine, user, auth_headers):
+    rng = random.Random(7)
+    when = datetime.utcnow() + timedelta(days=1)
+    with engine.begin() as conn:
+        task_ids = conn.execute(insert(Task).returning(Task.id), [{
+            "title": f"task {n}", "points": rng.randint(1, 10), "due_date": when,
+            "start_time": when, "end_time": when, "user_id": user.id,
+        } for n in range(TASKS)]).scalars().all()
+
+    async def complete_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+            # Every task is completed REPEAT times on its own and once more
+            # inside a batch, all at the same time.
+            requests = [
+                client.put(f"/api/tasks/{task_id}/complete", headers=auth_headers)
+                for task_id in task_ids for _ in range(REPEAT)
+            ]
+            shuffled = rng.sample(task_ids, len(task_ids))
+            requests += [
+                client.post("/api/tasks/batch", headers=auth_headers, json={
+                    "operations": [{"op": "complete", "id": task_id} for task_id in shuffled[n:n + 10]],
+                })
+                for n in range(0, len(shuffled), 10)
+            ]
+            rng.shuffle(requests)
+            return await asyncio.gather(*requests)
+
+    responses = asyncio.run(complete_all())
+
+    assert [response.status_code for response in responses if response.status_code != 200] == []
+    with engine.connect() as conn:
+        earned, still_open = conn.execute(
+            select(func.sum(Task.points), func.count().filter(Task.is_completed.isnot(True)))
+            .where(Task.user_id == user.id)
+        ).one()
+        balance = conn.execute(select(User.points).where(User.id == user.id)).scalar_one()
+        entries, ledger_total = conn.execute(
+            select(func.count(), func.sum(PointsLedger.delta)).where(PointsLedger.user_id == user.id)
+        ).one()
+        rollup_completed, rollup_points = conn.execute(
+            select(func.sum(UserDailyStats.completed), func.sum(UserDailyStats.points))
+            .where(UserDailyStats.user_id == user.id)
+        ).one()
+    assert still_open == 0
+    assert balance == ledger_total == rollup_points == earned
+    assert entries == rollup_completed == TASKS
+
+
+def test_reused_task_id_can_be_completed(client, user, auth_headers):
+    first = client.post("/api/tasks/", json=new_task(), headers=auth_headers).json()
+    assert client.put(f"/api/tasks/{first['id']}/complete", headers=auth_headers).status_code == 200
+    assert client.delete(f"/api/tasks/{first['id']}", headers=auth_headers).status_code == 200
+
+    # SQLite hands the highest deleted id to the next row.
+    second = client.post("/api/tasks/", json=new_task(), headers=auth_headers).json()
+    assert second["id"] == first["id"]
+    response = client.put(f"/api/tasks/{second['id']}/complete", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["is_completed"] is True
+
+    assert client.delete(f"/api/tasks/{second['id']}", headers=auth_headers).status_code == 200
+    third = client.post("/api/tasks/", json=new_task(), headers=auth_headers).json()
+    assert third["id"] == first["id"]
+    batch = client.post("/api/tasks/batch", headers=auth_headers, json={
+        "operations": [{"op": "complete", "id": third["id"]}],
+    })
+    assert batch.status_code == 200
+    assert batch.json()["points_awarded"] == 5
+
+
+def test_legacy_completion_evicts_the_shared_principal(client, user, auth_headers):
+    task = client.post("/api/tasks/", json=new_task(), headers=auth_headers).json()
+    assert principal_cache.get(user.email) is not None
+
+    response = client.put(f"{LEGACY_PREFIX}/tasks/{task['id']}/complete", headers=auth_headers)
+    assert response.status_code == 200
+    # The cached principal still has the old points balance.
+    assert principal_cache.get(user.email) is None
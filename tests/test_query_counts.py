@@ -0,0 +1,36 @@
+"""Query-count budgets for endpoints that nest collections.
+
+A new lazy relationship turns into one query per row; these fail as
+soon as that happens instead of waiting for a slow dashboard.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.db.query_count import assert_max_queries
+from backend.app.models import Goal, Task
+from backend.app.schemas.goal import GoalType
+from tests.conftest import LEGACY_PREFIX
+
+
+@pytest.fixture
+def account(db, user):
+    """Four goals with three tasks each, plus a few loose tasks."""
+    when = datetime.utcnow() + timedelta(days=7)
+    goals = [Goal(title=f"goal {n}", goal_type=GoalType.MONTHLY, target_date=when, user_id=user.id) for n in range(4)]
+    db.add_all(goals)
+    db.flush()
+    db.add_all(
+        Task(title=f"task {n}", due_date=when, start_time=when, end_time=when, user_id=user.id,
+             goal_id=goals[n % 4].id if n < 12 else None)
+        for n in range(15)
+    )
+    db.commit()
+    return user
+
+
+def test_goal_list_loads_tasks_in_one_query(client, engine, account, auth_headers):
+    with assert_max_queries(engine, 2):
+        response = client.get(f"{LEGACY_PREFIX}/goals/", headers=auth_headers)
+    assert response.status_code == 200
+    assert sorted(len(goal["tasks"]) for goal in response.json()) == [3, 3, 3, 3]
@@ -0,0 +1,68 @@
+"""The per-user list and date-range queries must be index searches.
+
+Each query is compiled with literal values and run through SQLite's
+``EXPLAIN QUERY PLAN``; the plan has to name the composite index meant
+for it and must not sort through a temporary b-tree.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text
+
+from backend.app.api.pagination import apply_keyset, encode_cursor
+from backend.app.db.sync import snapshot_query
+from backend.app.models import Goal, Journal, Task
+
+DAY = datetime(2026, 10, 17)
+CURSOR = encode_cursor(DAY, 10)
+
+
+def query_plan(engine, statement) -> str:
+    sql = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+HOT_QUERIES = {
+    "today's tasks": (
+        select(Task).where(Task.user_id == 1, Task.due_date >= DAY, Task.due_date < DAY + timedelta(days=1)),
+        "ix_tasks_user_id_due_date",
+    ),
+    "open tasks": (
+        select(Task).where(Task.user_id == 1, Task.is_completed.is_(False)),
+        "ix_tasks_user_id_is_completed",
+    ),
+    "tasks of goals": (
+        select(Task).where(Task.goal_id.in_([1, 2, 3])),
+        "ix_tasks_goal_id",
+    ),
+    "task page": (
+        apply_keyset(select(Task).where(Task.user_id == 1), Task.due_date, Task.id, CURSOR, 100),
+        "ix_tasks_user_id_due_date",
+    ),
+    "goal page": (
+        apply_keyset(select(Goal).where(Goal.user_id == 1), Goal.target_date, Goal.id, CURSOR, 100),
+        "ix_goals_user_id_target_date",
+    ),
+    "journal page": (
+        apply_keyset(select(Journal).where(Journal.user_id == 1), Journal.date, Journal.id, CURSOR, 100),
+        "ix_journals_user_id_date",
+    ),
+    "task snapshot page": (
+        snapshot_query(Task, 1, DAY, 10, 100),
+        "ix_tasks_user_id_updated_at",
+    ),
+    "goal snapshot page": (
+        snapshot_query(Goal, 1, DAY, 10, 100),
+        "ix_goals_user_id_updated_at",
+    ),
+}
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_index(engine, name):
+    statement, index = HOT_QUERIES[name]
+    plan = query_plan(engine, statement)
+    assert f"INDEX {index} " in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,129 @@
+"""Reminder digests against a local SMTP server."""
+import socket
+from datetime import datetime, timedelta
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+from backend import celery_app
+from backend.app.models import Task
+from backend.notifications import SMTPTransport, get_transport, set_transport
+
+
+class RecordingHandler:
+    """Accepts every message except for recipients listed in ``refuse``,
+    which get the given reply instead."""
+
+    def __init__(self):
+        self.refuse = {}
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.refuse:
+            return self.refuse[address]
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((session.peer, envelope.rcpt_tos[0]))
+        return "250 Message accepted"
+
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    set_transport(SMTPTransport(host="127.0.0.1", port=port, timeout=5))
+    try:
+        yield handler
+    finally:
+        set_transport(None)
+        controller.stop()
+
+
+@pytest.fixture
+def reminders(db, make_user):
+    """Two tasks for one user and one for another, as ``(task_id, email)`` pairs."""
+    soon = datetime.utcnow() + timedelta(minutes=15)
+    first, second = make_user(), make_user()
+    tasks = [Task(title=f"task {n}", due_date=soon, start_time=soon, end_time=soon, user_id=owner.id)
+             for n, owner in enumerate((first, first, second))]
+    db.add_all(tasks)
+    db.commit()
+    return [(task.id, owner.email) for task, owner in zip(tasks, (first, first, second))]
+
+
+def test_digests_share_one_connection(smtp_server, reminders):
+    assert celery_app.deliver_reminders(reminders) == {}
+
+    recipients = [recipient for _, recipient in smtp_server.messages]
+    assert sorted(recipients) == sorted({email for _, email in reminders})
+    assert len({peer for peer, _ in smtp_server.messages}) == 1
+
+
+def queued_retries(monkeypatch):
+    queued = []
+    monkeypatch.setattr(
+        celery_app.send_reminder_digest, "apply_async",
+        lambda args, countdown: queued.append(args),
+    )
+    return queued
+
+
+def test_only_the_temporarily_refused_user_is_retried(smtp_server, reminders, monkeypatch):
+    refused_task, refused = reminders[-1]
+    smtp_server.refuse[refused] = "451 4.3.0 Try again later"
+    queued = queued_retries(monkeypatch)
+
+    celery_app.send_task_reminders(reminders)
+
+    assert queued == [[refused, [refused_task]]]
+    assert [recipient for _, recipient in smtp_server.messages] == [reminders[0][1]]
+
+
+def test_permanently_refused_user_is_not_retried(smtp_server, reminders, monkeypatch):
+    refused = reminders[-1][1]
+    smtp_server.refuse[refused] = "550 5.1.1 No such user"
+    queued = queued_retries(monkeypatch)
+
+    celery_app.send_task_reminders(reminders)
+
+    assert queued == []
+    assert [recipient for _, recipient in smtp_server.messages] == [reminders[0][1]]
+
+
+def test_failed_send_discards_the_connection(smtp_server):
+    transport = get_transport()
+    transport.send("first@example.com", "subject", "body")
+    broken = transport._connection
+
+    def time_out(message):
+        raise TimeoutError("timed out")
+
+    broken.send_message = time_out
+    with pytest.raises(TimeoutError):
+        transport.send("second@example.com", "subject", "body")
+    transport.send("third@example.com", "subject", "body")
+
+    assert transport._connection is not broken
+    assert [recipient for _, recipient in smtp_server.messages] == ["first@example.com", "third@example.com"]
+
+
+def test_unexpected_error_only_retries_that_user(smtp_server, reminders, monkeypatch):
+    failing_task, failing = reminders[-1]
+    send = celery_app.send_notification
+
+    def flaky(recipient, subject, body):
+        if recipient == failing:
+            raise ValueError("unexpected")
+        send(recipient, subject, body)
+
+    monkeypatch.setattr(celery_app, "send_notification", flaky)
+    # Put the failing user first so the others come after the error.
+    assert celery_app.deliver_reminders(reminders[::-1]) == {failing: [failing_task]}
+    assert [recipient for _, recipient in smtp_server.messages] == [reminders[0][1]]
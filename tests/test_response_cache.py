@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from backend.app.api.cache import MemoryBackend, response_cache
+from backend.app.models import User
+from tests.conftest import LEGACY_PREFIX
+
+
+def new_task(hours=1):
+    when = (datetime.utcnow() + timedelta(hours=hours)).isoformat()
+    return {"title": "write report", "points": 3, "due_date": when, "start_time": when, "end_time": when}
+
+
+def test_unchanged_list_revalidates_with_304(client, auth_headers):
+    first = client.get("/api/tasks/", headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = client.get("/api/tasks/", headers={**auth_headers, "If-None-Match": etag})
+    assert again.status_code == 304
+
+    assert client.post("/api/tasks/", json=new_task(), headers=auth_headers).status_code == 200
+    changed = client.get("/api/tasks/", headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert len(changed.json()) == 1
+
+
+def test_dashboard_reads_points_from_the_database(client, auth_headers, user, db):
+    # The first request caches the principal with its balance of 0.
+    assert client.get(f"{LEGACY_PREFIX}/dashboard/stats", headers=auth_headers).json()["total_points"] == 0
+
+    # Another worker credits points and invalidates the shared cache; this
+    # worker's cached principal still holds the old balance.
+    db.execute(update(User).where(User.id == user.id).values(points=7))
+    db.commit()
+    asyncio.run(response_cache.bump(user.id))
+
+    assert client.get(f"{LEGACY_PREFIX}/dashboard/stats", headers=auth_headers).json()["total_points"] == 7
+
+
+def test_memory_versions_are_bounded_and_never_reused():
+    async def run():
+        backend = MemoryBackend(maxsize=2)
+        before_write = await backend.version(1)
+        await backend.bump(1)
+        after_write = await backend.version(1)
+        await backend.bump(2)
+        await backend.bump(3)  # evicts user 1
+        assert len(backend._versions) == 2
+        assert await backend.version(1) != before_write
+        assert await backend.version(1) == after_write
+
+    asyncio.run(run())
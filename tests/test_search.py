@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta
+
+
+def test_hits_escape_user_text_and_mark_matches(client, auth_headers):
+    when = (datetime.utcnow() + timedelta(days=1)).isoformat()
+    task = {
+        "title": "<b>Gardening</b> & weeding",
+        "description": "Buy <img src=x onerror=alert(1)> seeds for the garden",
+        "due_date": when, "start_time": when, "end_time": when,
+    }
+    assert client.post("/api/tasks/", json=task, headers=auth_headers).status_code == 200
+
+    hits = client.get("/api/search/", params={"q": "garden"}, headers=auth_headers).json()
+
+    assert len(hits) == 1
+    assert hits[0]["title"] == "&lt;b&gt;<mark>Gardening</mark>&lt;/b&gt; &amp; weeding"
+    assert "&lt;img src=x onerror=alert(1)&gt;" in hits[0]["snippet"]
+    assert "<mark>garden</mark>" in hits[0]["snippet"]
+    assert "<img" not in hits[0]["snippet"]
@@ -0,0 +1,88 @@
+"""Delta sync: snapshots come in bounded pages, deltas follow the token."""
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend.app.db.sync import changes_since, database_now
+
+from .conftest import ROOT
+
+
+def when(days=7):
+    return (datetime.utcnow() + timedelta(days=days)).isoformat()
+
+
+def create_rows(client, auth_headers, tasks=5, goals=3):
+    task_body = {"title": "task", "due_date": when(), "start_time": when(), "end_time": when()}
+    goal_body = {"title": "goal", "goal_type": "monthly", "target_date": when(30)}
+    task_ids = {client.post("/api/tasks/", json=task_body, headers=auth_headers).json()["id"] for _ in range(tasks)}
+    goal_ids = {client.post("/api/goals/", json=goal_body, headers=auth_headers).json()["id"] for _ in range(goals)}
+    return task_ids, goal_ids
+
+
+def test_snapshot_is_paged(client, auth_headers):
+    task_ids, goal_ids = create_rows(client, auth_headers)
+
+    pages = [client.get("/api/sync/?limit=3", headers=auth_headers).json()]
+    while pages[-1]["more"]:
+        cursor = pages[-1]["cursor"]
+        pages.append(client.get(f"/api/sync/?limit=3&cursor={cursor}", headers=auth_headers).json())
+
+    assert len(pages) == 3
+    assert all(page["reset"] for page in pages)
+    assert all(len(page["tasks"]) + len(page["goals"]) <= 3 for page in pages)
+    assert pages[0]["user"] is not None and pages[1]["user"] is None
+    assert [page["token"] is not None for page in pages] == [False, False, True]
+    assert [task["id"] for page in pages for task in page["tasks"]] == sorted(task_ids)
+    assert [goal["id"] for page in pages for goal in page["goals"]] == sorted(goal_ids)
+
+
+def test_delta_follows_snapshot_token(client, auth_headers):
+    task_ids, goal_ids = create_rows(client, auth_headers, tasks=2, goals=2)
+    token = client.get("/api/sync/", headers=auth_headers).json()["token"]
+    task_id, goal_id = min(task_ids), min(goal_ids)
+    client.put(f"/api/tasks/{task_id}", json={"title": "renamed"}, headers=auth_headers)
+    client.delete(f"/api/goals/{goal_id}", headers=auth_headers)
+
+    delta = client.get(f"/api/sync/?since={token}", headers=auth_headers).json()
+
+    assert not delta["reset"] and not delta["more"] and delta["token"]
+    assert {task["id"]: task["title"] for task in delta["tasks"]}[task_id] == "renamed"
+    assert delta["deleted"]["goals"] == [goal_id]
+
+
+def test_database_now_is_naive_utc():
+    class AwareClock:
+        def execute(self, statement):
+            return self
+
+        def scalar_one(self):
+            return datetime(2026, 3, 1, 14, 30, tzinfo=timezone(timedelta(hours=2)))
+
+    assert database_now(AwareClock()) == datetime(2026, 3, 1, 12, 30)
+
+
+def test_bad_cursor_is_400(client, auth_headers):
+    response = client.get("/api/sync/?cursor=bm9wZQ", headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_migrated_database_syncs(tmp_path, monkeypatch):
+    # env.py points alembic at ./productivity_plus.db.
+    from alembic import command
+    from alembic.config import Config
+
+    monkeypatch.chdir(tmp_path)
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "migrations"))
+    command.upgrade(config, "head")
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'productivity_plus.db'}")
+    try:
+        with Session(engine) as db:
+            changes = changes_since(db, 1, None, 10)
+        assert changes["reset"] and changes["tasks"] == []
+    finally:
+        engine.dispose()